@@ -2,43 +2,90 @@
 
 It handles the initialization of the bot, sets up scheduled tasks for sending messages and media,
 and manages user interactions. The module integrates with the worker functions to perform various
-tasks such as sending greetings, media items, and reminders, while utilizing the APScheduler for
-task scheduling.
+tasks such as sending greetings, media items, and reminders, which are scheduled directly on the
+asyncio event loop.
 """
 
 import asyncio
+import functools
 import logging
-import logging.config
-from configparser import ConfigParser, ExtendedInterpolation
+import re
+import signal
+from collections.abc import Awaitable, Callable
+from configparser import ConfigParser
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from telethon import TelegramClient, events
 from telethon.tl.custom.message import Message
+from telethon.tl.types import InputPeerSelf
 
 from src import worker
+from src.utils.logging_config import setup_logging
+
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
+setup_logging()
+log = logging.getLogger(__name__)
+
+if uvloop is not None:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    log.debug("Using uvloop as the asyncio event loop.")
+
+# Hiding the logs from other modules. Telethon logs through child loggers of "telethon", which
+# inherit its level, so the level is what keeps their calls cheap; disabling the logger and
+# stopping the propagation drops anything that still gets through before reaching the handlers.
+telethon_logger = logging.getLogger("telethon")
+telethon_logger.setLevel(logging.CRITICAL)
+telethon_logger.disabled = True
+telethon_logger.propagate = False
+
+log.debug("Trying to read the configuration file...")
+config = ConfigParser(interpolation=None)
+config.read("config.ini")
+telegram_config = config["Telegram"]
+api_id, api_hash = telegram_config["api_id"], telegram_config["api_hash"]
+log.debug("The configuration file was read successfully.")
 
-logging.config.fileConfig("logging.conf")
+client = TelegramClient("src/data/bot", api_id, api_hash)
 
-# Hidding non-critical logs from other modules
-logging.getLogger("telethon").setLevel(logging.CRITICAL)
-logging.getLogger("apscheduler").setLevel(logging.CRITICAL)
 
-logging.info("User bot is connecting...")
+def logged_handler(
+    handler: Callable[[Message | events.NewMessage], Awaitable[None]],
+) -> Callable[[Message | events.NewMessage], Awaitable[None]]:
+    """Logs any error raised by a command handler before propagating it.
 
-logging.debug("Trying to read the configuration file...")
-config = ConfigParser(interpolation=ExtendedInterpolation())
-config.read("config.ini")
-logging.debug("The configuration file was read successfully.")
+    This decorator wraps a command handler so that, if it raises, the error is logged along with
+    the handler name and the event that triggered it, and then re-raised with its original
+    traceback.
+
+    Args:
+        handler (Callable[[Message | events.NewMessage], Awaitable[None]]): The command handler to
+            be wrapped.
+
+    Returns:
+        Callable[[Message | events.NewMessage], Awaitable[None]]: The wrapped command handler.
+    """
+
+    @functools.wraps(handler)
+    async def wrap(event: Message | events.NewMessage):
+        """Runs the command handler, logging and re-raising any error it raises.
+
+        Args:
+            event (Message | events.NewMessage): The event object representing the incoming message.
+        """
+        try:
+            await handler(event)
+
+        except Exception:
+            log.exception("Error in `%s` | event = %s", handler.__name__, event)
+            raise
 
-logging.debug("Trying to connect the user bot client to Telegram...")
-client = TelegramClient(
-    "src/data/bot", config.get("Telegram", "api_id"), config.get("Telegram", "api_hash")
-).start()
-logging.debug("User bot client connected to Telegram successfully.")
-logging.info("User bot connected!")
+    return wrap
 
 
-@client.on(events.NewMessage("me", pattern="/health"))
+@logged_handler
 async def handle_health(event: Message | events.NewMessage):
     """Handles the /health command and responds with the application's health status.
 
@@ -52,21 +99,12 @@ async def handle_health(event: Message | events.NewMessage):
     Raises:
         Exception: If there is an error while sending the reply.
     """
-    logging.debug("Running method `handle_health`...")
-    try:
-        health_status = worker.health()
-        logging.info("Sending health status response: %s", health_status)
-        await event.reply(health_status)
-        logging.info("Health status sent successfully.")
+    health_status = worker.health()
+    await event.reply(health_status)
+    log.info("Health status sent: %s", health_status)
 
-    except Exception as e:
-        logging.error("Error while sending health status response: %s | event = %s", e, event)
-        raise e
 
-    logging.debug("Method `handle_health` finished.")
-
-
-@client.on(events.NewMessage("me", pattern="/greeting_info"))
+@logged_handler
 async def handle_greeting_info(event: Message | events.NewMessage):
     """Handles the /greeting_info command and responds with the next greeting time.
 
@@ -80,84 +118,52 @@ async def handle_greeting_info(event: Message | events.NewMessage):
     Raises:
         Exception: If there is an error while sending the reply.
     """
-    logging.debug("Running method `handle_greeting_info`...")
-    try:
-        next_greeting_time = worker.next_greeting_time
-        logging.info("Next greeting time retrieved: %s", next_greeting_time)
-
-        await event.reply(f"Next greeting at {next_greeting_time}")
-        logging.info("Greeting info sent successfully.")
-
-    except Exception as e:
-        logging.error("Error while sending greeting info response: %s | event = %s", e, event)
-        raise e
-
-    logging.debug("Method `handle_greeting_info` finished.")
+    next_greeting_info = worker.schedule_state.next_greeting_info
+    await event.reply(next_greeting_info)
+    log.info("Greeting info sent: %s", next_greeting_info)
 
 
-@client.on(events.NewMessage("me", pattern="/send_greeting"))
+@logged_handler
 async def handle_send_greeting(event: Message | events.NewMessage):
     """Handles the /send_greeting command to send a morning greeting.
 
     This asynchronous function listens for messages containing the /send_greeting command and
-    triggers the sending of a morning greeting via the Telegram client. It then replies to the user
-    to confirm that the action has been completed.
+    triggers the sending of a morning greeting via the Telegram client. It then edits the command
+    message to confirm that the action has been completed.
 
     Args:
         event (Message | events.NewMessage): The event object representing the incoming message.
 
     Raises:
-        Exception: If there is an error while sending the greeting or the reply.
+        Exception: If there is an error while sending the greeting or editing the message.
     """
-    logging.debug("Running method `handle_send_greeting`...")
-    try:
-        logging.info("Triggering the sending of the morning greeting...")
-        await worker.send_morning_greeting(client)
-        logging.info("Morning greeting sent successfully.")
+    await worker.send_morning_greeting(client)
+    log.info("Morning greeting sent successfully.")
 
-        await event.reply("Done!")
-        logging.info("Confirmation reply sent to user.")
+    await event.edit(f"{event.raw_text} ✅")
 
-    except Exception as e:
-        logging.error("Error while sending morning greeting or reply: %s | event = %s", e, event)
-        raise e
 
-    logging.debug("Method `handle_send_greeting` finished.")
-
-
-@client.on(events.NewMessage("me", pattern="/test_greeting"))
+@logged_handler
 async def handle_test_greeting(event: Message | events.NewMessage):
     """Handles the /test_greeting command to send a test morning greeting.
 
     This asynchronous function listens for messages containing the /test_greeting command and
     triggers the sending of a morning greeting via the Telegram client without marking it as used.
-    It then replies to the user to confirm that the action has been completed.
+    It then edits the command message to confirm that the action has been completed.
 
     Args:
         event (Message | events.NewMessage): The event object representing the incoming message.
 
     Raises:
-        Exception: If there is an error while sending the greeting or the reply.
+        Exception: If there is an error while sending the greeting or editing the message.
     """
-    logging.debug("Running method `handle_test_greeting`...")
-    try:
-        logging.info("Triggering the sending of a test morning greeting...")
-        await worker.send_morning_greeting(client, user_id="me", set_as_used=False)
-        logging.info("Test morning greeting sent successfully.")
-
-        await event.reply("Done!")
-        logging.info("Confirmation reply sent to user.")
-
-    except Exception as e:
-        logging.error(
-            "Error while sending test morning greeting or reply: %s | event = %s", e, event
-        )
-        raise e
+    await worker.send_morning_greeting(client, user_id="me", set_as_used=False)
+    log.info("Test morning greeting sent successfully.")
 
-    logging.debug("Method `handle_test_greeting` finished.")
+    await event.edit(f"{event.raw_text} ✅")
 
 
-@client.on(events.NewMessage("me", pattern="/afternoon_media_info"))
+@logged_handler
 async def handle_afternoon_media(event: Message | events.NewMessage):
     """Handles the /afternoon_media_info command and responds with the next media time.
 
@@ -171,86 +177,52 @@ async def handle_afternoon_media(event: Message | events.NewMessage):
     Raises:
         Exception: If there is an error while sending the reply.
     """
-    logging.debug("Running method `handle_afternoon_media`...")
-    try:
-        next_afternoon_media_time = worker.next_afternoon_media_time
-        logging.info("Next afternoon media time retrieved: %s", next_afternoon_media_time)
+    next_afternoon_media_info = worker.schedule_state.next_afternoon_media_info
+    await event.reply(next_afternoon_media_info)
+    log.info("Afternoon media info sent: %s", next_afternoon_media_info)
 
-        await event.reply(f"Next media at {next_afternoon_media_time}")
-        logging.info("Afternoon media info sent successfully.")
 
-    except Exception as e:
-        logging.error(
-            "Error while sending afternoon media info response: %s | event = %s", e, event
-        )
-        raise e
-
-    logging.debug("Method `handle_afternoon_media` finished.")
-
-
-@client.on(events.NewMessage("me", pattern="/send_afternoon_media"))
+@logged_handler
 async def handle_send_afternoon_media(event: Message | events.NewMessage):
     """Handles the /send_afternoon_media command to send an afternoon media item.
 
     This asynchronous function listens for messages containing the /send_afternoon_media command
-    and triggers the sending of an afternoon media item via the Telegram client. It then replies to
-    the user to confirm that the action has been completed.
+    and triggers the sending of an afternoon media item via the Telegram client. It then edits the
+    command message to confirm that the action has been completed.
 
     Args:
         event (Message | events.NewMessage): The event object representing the incoming message.
 
     Raises:
-        Exception: If there is an error while sending the media or the reply.
+        Exception: If there is an error while sending the media or editing the message.
     """
-    logging.debug("Running method `handle_send_afternoon_media`...")
-    try:
-        logging.info("Triggering the sending of the afternoon media item...")
-        await worker.send_afternoon_media(client)
-        logging.info("Afternoon media sent successfully.")
-
-        await event.reply("Done!")
-        logging.info("Confirmation reply sent to user.")
-
-    except Exception as e:
-        logging.error("Error while sending afternoon media or reply: %s | event = %s", e, event)
-        raise e
+    await worker.send_afternoon_media(client)
+    log.info("Afternoon media sent successfully.")
 
-    logging.debug("Method `handle_send_afternoon_media` finished.")
+    await event.edit(f"{event.raw_text} ✅")
 
 
-@client.on(events.NewMessage("me", pattern="/test_afternoon_media"))
+@logged_handler
 async def handle_test_afternoon_media(event: Message | events.NewMessage):
     """Handles the /test_afternoon_media command to send a test afternoon media item.
 
     This asynchronous function listens for messages containing the /test_afternoon_media command
     and triggers the sending of an afternoon media item via the Telegram client without marking it
-    as used. It then replies to the user to confirm that the action has been completed.
+    as used. It then edits the command message to confirm that the action has been completed.
 
     Args:
         event (Message | events.NewMessage): The event object representing the incoming message.
 
     Raises:
-        Exception: If there is an error while sending the media or the reply.
+        Exception: If there is an error while sending the media or editing the message.
     """
-    logging.debug("Running method `handle_test_afternoon_media`...")
-    try:
-        logging.info("Triggering the sending of a test afternoon media item...")
-        await worker.send_afternoon_media(client, user_id="me", set_as_used=False)
-        logging.info("Test afternoon media sent successfully.")
+    await worker.send_afternoon_media(client, user_id="me", set_as_used=False)
+    log.info("Test afternoon media sent successfully.")
 
-        await event.reply("Done!")
-        logging.info("Confirmation reply sent to user.")
+    await event.edit(f"{event.raw_text} ✅")
 
-    except Exception as e:
-        logging.error(
-            "Error while sending test afternoon media or reply: %ss | event = %s", e, event
-        )
-        raise e
 
-    logging.debug("Method `handle_test_afternoon_media` finished.")
-
-
-@client.on(events.NewMessage("me", pattern="/stats"))
+@logged_handler
 async def handle_stats(event: Message | events.NewMessage):
     """Handles the /stats command to send statistics to the user.
 
@@ -264,54 +236,100 @@ async def handle_stats(event: Message | events.NewMessage):
     Raises:
         Exception: If there is an error while sending the statistics.
     """
-    logging.debug("Running method `handle_stats`...")
-    try:
-        logging.info("Triggering the sending of application statistics...")
-        await worker.send_stats(client, user_id="me")
-        logging.info("Statistics sent successfully.")
+    await worker.send_stats(client, user_id="me")
+    log.info("Statistics sent successfully.")
+
+
+COMMANDS: dict[str, Callable[[Message | events.NewMessage], Awaitable[None]]] = {
+    "health": handle_health,
+    "greeting_info": handle_greeting_info,
+    "send_greeting": handle_send_greeting,
+    "test_greeting": handle_test_greeting,
+    "afternoon_media_info": handle_afternoon_media,
+    "send_afternoon_media": handle_send_afternoon_media,
+    "test_afternoon_media": handle_test_afternoon_media,
+    "stats": handle_stats,
+}
+COMMAND_PATTERN = re.compile(rf"^/({'|'.join(map(re.escape, COMMANDS))})$")
+ME = InputPeerSelf()
 
-    except Exception as e:
-        logging.error("Error while sending statistics: %ss | event = %s", e, event)
-        raise e
 
-    logging.debug("Method `handle_stats` finished.")
+@client.on(events.NewMessage(ME, pattern=COMMAND_PATTERN))
+async def handle_command(event: Message | events.NewMessage):
+    """Dispatches a command sent to the user bot to its handler.
+
+    This asynchronous function is the only listener registered for commands, so every incoming
+    message is matched against a single precompiled pattern instead of one pattern per command. The
+    pattern only accepts the commands in `COMMANDS`, so the matched name is used to look up and
+    await the corresponding handler directly.
+
+    Args:
+        event (Message | events.NewMessage): The event object representing the incoming message.
+    """
+    await COMMANDS[event.pattern_match.group(1)](event)
 
 
 async def main():
     """Main entry point for starting the Telegram bot and scheduling tasks.
 
-    This asynchronous function initializes the scheduler and starts the various tasks for sending
-    morning greetings, afternoon media, and pill reminders. It then enters an infinite loop to keep
-    the application running and responsive.
+    This asynchronous function connects the client to Telegram, resolves the peers of the users and
+    then schedules the various tasks for sending morning greetings, afternoon media, and pill
+    reminders. The tasks are scheduled only once the client is connected, so a task whose time has
+    already passed today does not fire during the login. It then waits, without polling, until a
+    SIGINT or SIGTERM is received, and finally cancels the scheduled tasks, disconnects the client
+    and closes the register database.
+
+    On Python 3.12 and newer, the tasks of the loop are created by the eager task factory, so a
+    task starts running right away and never gets scheduled if it finishes without suspending.
     """
-    logging.info("Starting the scheduler...")
-    logging.debug("Initializing the scheduler...")
-    scheduler = AsyncIOScheduler()
-    logging.debug("Scheduler initialized successfully.")
+    loop = asyncio.get_running_loop()
+    if hasattr(asyncio, "eager_task_factory"):  # Python 3.12+
+        loop.set_task_factory(asyncio.eager_task_factory)
+        log.debug("Using the eager task factory.")
+
+    log.info("User bot is connecting...")
+    await client.start()
+    log.info("User bot connected!")
 
-    logging.debug("Scheduling morning greeting task...")
-    worker.start_sending_morning_greeting(scheduler, client, try_today=True)
-    logging.debug("Morning greeting task scheduled successfully.")
+    log.debug("Resolving the peers of the users...")
+    await worker.prime_peers(client)
+    log.debug("Peers of the users resolved successfully.")
 
-    logging.debug("Scheduling afternoon media task...")
-    worker.start_sending_afternoon_media(scheduler, client, try_today=True)
-    logging.debug("Afternoon media task scheduled successfully.")
+    log.info("Scheduling the tasks...")
+    log.debug("Scheduling morning greeting task...")
+    worker.start_sending_morning_greeting(client, try_today=True)
+    log.debug("Morning greeting task scheduled successfully.")
 
-    logging.debug("Scheduling pill reminder task...")
-    worker.start_sending_pills_reminder(scheduler, client)
-    logging.debug("Pill reminder task scheduled successfully.")
+    log.debug("Scheduling afternoon media task...")
+    worker.start_sending_afternoon_media(client, try_today=True)
+    log.debug("Afternoon media task scheduled successfully.")
 
-    logging.debug("Setting up handler to stop pill reminders for today...")
+    log.debug("Scheduling pill reminder task...")
+    worker.start_sending_pills_reminder(client)
+    log.debug("Pill reminder task scheduled successfully.")
+
+    log.debug("Setting up handler to stop pill reminders for today...")
     worker.handle_stop_sending_pill_reminder_for_today(client)
-    logging.debug("Handler to stop pill reminders for today set up successfully.")
+    log.debug("Handler to stop pill reminders for today set up successfully.")
+
+    log.debug("Installing the shutdown signal handlers...")
+    stop_event = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:  # The event loops on Windows do not support signal handlers
+            signal.signal(sig, lambda *_: loop.call_soon_threadsafe(stop_event.set))
+    log.debug("Shutdown signal handlers installed successfully.")
 
-    logging.debug("Starting the scheduler...")
-    scheduler.start()
-    logging.debug("Scheduler started successfully.")
+    log.info("User bot is now running!")
+    await stop_event.wait()
 
-    logging.info("User bot is now running!")
-    while True:
-        await asyncio.sleep(1)
+    log.info("User bot is shutting down...")
+    worker.cancel_scheduled_jobs()
+    await client.disconnect()
+    worker.close_register_db()
+    log.info("User bot stopped!")
 
 
-client.loop.run_until_complete(main())
+if __name__ == "__main__":
+    client.loop.run_until_complete(main())
@@ -6,7 +6,6 @@ functions to perform tasks such as sending messages and managing media, while pr
 way to interact with the application through command-line commands.
 """
 
-import inspect
 import subprocess
 import sys
 from argparse import (
@@ -15,14 +14,35 @@ from argparse import (
     Namespace,
     _SubParsersAction,
 )
+from collections.abc import Callable
+
+_CLI_REGISTRY: list[Callable[[_SubParsersAction], None]] = []
+
+
+def cli(fn: Callable[[_SubParsersAction], None]) -> Callable[[_SubParsersAction], None]:
+    """Registers a function that sets up the command-line interface of a command.
+
+    This decorator appends the decorated function to the CLI registry, so `parse_args` can set up
+    every command without inspecting the members of this module.
+
+    Args:
+        fn (Callable[[argparse._SubParsersAction], None]): The function that adds the command to the
+            CLI.
+
+    Returns:
+        Callable[[argparse._SubParsersAction], None]: The same function, unchanged.
+    """
+    _CLI_REGISTRY.append(fn)
+    return fn
 
 
 def deploy(args: Namespace):
     """Deploys the Docker container for the Telegram Auto Texter application.
 
-    This function checks for any running instances of the Telegram Auto Texter container and
-    optionally copies the register file from the container to the local directory. It then builds
-    a new Docker image with the specified name and tag, and runs the container in detached mode.
+    This function checks for any running instances of the Telegram Auto Texter container, stops
+    them and optionally copies the register database from the container to the local data
+    directory. It then builds a new Docker image with the specified name and tag, and runs the
+    container in detached mode.
 
     Args:
         args (argparse.Namespace): The command-line arguments containing options for deployment,
@@ -31,7 +51,7 @@ def deploy(args: Namespace):
     Raises:
         subprocess.CalledProcessError: If any of the subprocess commands fail during execution.
     """
-    proc = subprocess.Popen(
+    cid = subprocess.run(
         [
             "docker",
             "ps",
@@ -41,28 +61,29 @@ def deploy(args: Namespace):
             "-f",
             "status=running",
         ],
-        stdout=subprocess.PIPE,
-        shell=True,
-    )
-    out, err = proc.communicate()
-    cid = out.decode("utf-8").strip()
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
     if cid != "":
+        # The container is stopped first, so the register database is closed and complete
+        subprocess.run(["docker", "stop", cid])
         if args.register:
             subprocess.run(
                 [
                     "docker",
                     "container",
                     "cp",
-                    f"{cid}:/telegram-auto-texter/src/data/register.yaml",
-                    "src/",
+                    f"{cid}:/telegram-auto-texter/src/data/register.sqlite",
+                    "src/data/",
                 ]
             )
-        subprocess.run(["docker", "stop", cid])
 
-    subprocess.run(["docker", "build", ".", "-t" f"{args.name}:{args.tag}"])
+    subprocess.run(["docker", "build", ".", "-t", f"{args.name}:{args.tag}"])
     subprocess.run(["docker", "run", "-d", f"{args.name}:{args.tag}"])
 
 
+@cli
 def deploy_cli(subparsers: _SubParsersAction):
     """Sets up the command-line interface for the deploy command.
 
@@ -85,8 +106,8 @@ def deploy_cli(subparsers: _SubParsersAction):
 def parse_args() -> Namespace:
     """Parses command-line arguments for the application.
 
-    This function sets up an argument parser with subcommands based on functions that end with
-    '_cli' in the current module. It returns the parsed arguments, allowing the application to
+    This function sets up an argument parser with subcommands based on the functions registered
+    with the `cli` decorator. It returns the parsed arguments, allowing the application to
     handle different commands and options provided by the user.
 
     Returns:
@@ -99,9 +120,8 @@ def parse_args() -> Namespace:
     parser = ArgumentParser("qwerty", formatter_class=ArgumentDefaultsHelpFormatter)
 
     subparsers = parser.add_subparsers(dest="command")
-    for name, obj in inspect.getmembers(sys.modules[__name__]):
-        if inspect.isfunction(obj) and name.endswith("_cli"):
-            obj(subparsers)
+    for setup_cli in _CLI_REGISTRY:
+        setup_cli(subparsers)
 
     return parser.parse_args()
 
@@ -1,11 +1,15 @@
-"""This module contains functionality for sending morning greeting messages.
+"""This module contains functionality for generating morning greeting messages.
 
-It includes the scheduling of morning greetings using a specified time range and a Telegram client.
-The module leverages the APScheduler for job scheduling and allows for dynamic configuration of
-greeting times, enabling automated daily greetings to be sent at random times within the defined
-interval.
+It includes the tokens and the sentence generator used to build random good morning greetings, and
+the `get_morning_greeting` function, which decorates a generated greeting with random emojis. The
+variable-length words (such as "amooor" or "Holaaa") are generated at evaluation time, so every
+greeting can be slightly different.
 """
 
+import random
+from collections.abc import Sequence
+from typing import TypeVar
+
 from src.sentence_generator.sentence_generator import (
     CustomGeneratedText,
     SentenceGenerator,
@@ -13,6 +17,33 @@ from src.sentence_generator.sentence_generator import (
 )
 from src.utils.random import low_random
 
+_T = TypeVar("_T")
+
+# Longest runs of repeated letters, sliced to the random length instead of multiplied every time.
+_A5 = "a" * 5
+_A10 = "a" * 10
+_O10 = "o" * 10
+
+
+def _low_pick(tokens: Sequence[_T]) -> _T:
+    """Pick an element of a sequence with a bias towards the first ones.
+
+    This function is shared by every token that picks its next token with a low-biased random
+    index, so a single function object is used instead of one lambda per token.
+
+    Args:
+        tokens (Sequence[_T]): The sequence to pick an element from.
+
+    Returns:
+        _T: The picked element.
+    """
+    return tokens[low_random(0, len(tokens) - 1)]
+
+
+# Terminal token without text, shared by every chain that may end without another word. It must
+# never get next tokens.
+_EMPTY_TOKEN = Token("")
+
 amor = Token("amor")
 mi_amor = Token("mi amor")
 
@@ -22,14 +53,14 @@ mi_amorcita = Token("mi amorcita")
 amorcito = Token("amorcito")
 mi_amorcito = Token("mi amorcito")
 
-amooor = Token(CustomGeneratedText(lambda: "am" + "o" * low_random(1, 10) + "r"))
-mi_amooor = Token(CustomGeneratedText(lambda: "mi am" + "o" * low_random(1, 10) + "r"))
+amooor = Token(CustomGeneratedText(lambda: "am" + _O10[: low_random(1, 10)] + "r"))
+mi_amooor = Token(CustomGeneratedText(lambda: "mi am" + _O10[: low_random(1, 10)] + "r"))
 
-amorcitaaa = Token(CustomGeneratedText(lambda: "amorcit" + "a" * low_random(1, 10)))
-mi_amorcitaaa = Token(CustomGeneratedText(lambda: "mi amorcit" + "a" * low_random(1, 10)))
+amorcitaaa = Token(CustomGeneratedText(lambda: "amorcit" + _A10[: low_random(1, 10)]))
+mi_amorcitaaa = Token(CustomGeneratedText(lambda: "mi amorcit" + _A10[: low_random(1, 10)]))
 
-amorcitooo = Token(CustomGeneratedText(lambda: "amorcit" + "o" * low_random(1, 10)))
-mi_amorcitooo = Token(CustomGeneratedText(lambda: "mi amorcit" + "o" * low_random(1, 10)))
+amorcitooo = Token(CustomGeneratedText(lambda: "amorcit" + _O10[: low_random(1, 10)]))
+mi_amorcitooo = Token(CustomGeneratedText(lambda: "mi amorcit" + _O10[: low_random(1, 10)]))
 
 mailob = Token("mailob")
 my_love = Token("my love")
@@ -50,7 +81,7 @@ general_right_part: list[Token] = [
 ]
 
 
-hola = Token(CustomGeneratedText(lambda: "Hol" + "a" * low_random(1, 10))).add_next_tokens(
+hola = Token(CustomGeneratedText(lambda: "Hol" + _A10[: low_random(1, 10)])).add_next_tokens(
     *general_right_part
 )
 buenos_dias = Token("Buenos días").add_next_tokens(
@@ -64,10 +95,10 @@ wenas = (
         *[
             Token(
                 token.value,
-                pick_next=lambda tokens: tokens[low_random(0, len(tokens) - 1)],
+                pick_next=_low_pick,
             ).add_next_tokens(
-                Token(""),
-                Token(CustomGeneratedText(lambda: "wen" + "a" * low_random(1, 5) + "s")),
+                _EMPTY_TOKEN,
+                Token(CustomGeneratedText(lambda: "wen" + _A5[: low_random(1, 5)] + "s")),
             )
             for token in general_right_part
         ]
@@ -116,7 +147,68 @@ sentences = SentenceGenerator(
         bonjour,
         buongiorno,
     ]
+).compile()
+
+
+_EMOJI1: tuple[str, ...] = (
+    "",
+    "\U0001f44b",  # 👋
+    "\U0000270c",  # Hand with 2 raised fingers
+)
+_EMOJI2: tuple[str, ...] = (
+    "",
+    "\U0001f61b",  # 😛
+    "\U0001f61d",  # 😝
+    "\U0001f92a",  # 🤪
+    "\U0001f60b",  # 😋
+)
+_EMOJI3: tuple[str, ...] = (
+    "",
+    "\U0001f643",  # 🙃
+    "\U0001f601",  # 😁
+    "\U0001f604",  # 😄
+    "\U0001f603",  # 😃
 )
+_EMOJI4: tuple[str, ...] = (
+    "",
+    "\U0001f917",  # 🤗
+    "\U0001f61a",  # 😚
+    "\U0001f60a",  # 😊
+    "\U0000263a",  # ☺ smiling face
+    "\U0001f92d",  # 🤭
+)
+_EMOJI5: tuple[str, ...] = (
+    "",
+    "\U0001f970",  # 🥰
+    "\U0001f618",  # 😘
+)
+_EMOJI6: tuple[str, ...] = (
+    "",
+    "\U0001faf6",  # 🫶
+    "\U00002764",  # ❤ red heart
+)
+# Each list of emojis along with the `low_random` power used to pick from it.
+_EMOJI_TABLE: tuple[tuple[tuple[str, ...], float], ...] = (
+    (_EMOJI1, 3.5),
+    (_EMOJI2, 5.0),
+    (_EMOJI3, 4.0),
+    (_EMOJI4, 3.0),
+    (_EMOJI5, 1.3),
+    (_EMOJI6, 2.0),
+)
+
+
+def get_all_emojis() -> str:
+    """Get a random text made of emojis.
+
+    This function picks one emoji from each list in `_EMOJI_TABLE`, using its power parameter to
+    bias the selection (refer to `utils.random.low_random` documentation), and joins them into a
+    fun and varied emoji text. The first element of every list is empty, so the result may be empty.
+
+    Returns:
+        str: The random text made of emojis.
+    """
+    return "".join([emojis[low_random(1, len(emojis), p) - 1] for emojis, p in _EMOJI_TABLE])
 
 
 def get_morning_greeting() -> str:
@@ -130,81 +222,10 @@ def get_morning_greeting() -> str:
     """
     greeting: str = sentences.eval()
 
-    emoji1: list[str] = [
-        "",
-        "\U0001f44b",  # 👋
-        "\U0000270c",  # Hand with 2 raised fingers
-    ]
-    emoji2: list[str] = [
-        "",
-        "\U0001f61b",  # 😛
-        "\U0001f61d",  # 😝
-        "\U0001f92a",  # 🤪
-        "\U0001f60b",  # 😋
-    ]
-    emoji3: list[str] = [
-        "",
-        "\U0001f643",  # 🙃
-        "\U0001f601",  # 😁
-        "\U0001f604",  # 😄
-        "\U0001f603",  # 😃
-    ]
-    emoji4: list[str] = [
-        "",
-        "\U0001f917",  # 🤗
-        "\U0001f61a",  # 😚
-        "\U0001f60a",  # 😊
-        "\U0000263a",  # ☺ smiling face
-        "\U0001f92d",  # 🤭
-    ]
-    emoji5: list[str] = [
-        "",
-        "\U0001f970",  # 🥰
-        "\U0001f618",  # 😘
-    ]
-    emoji6: list[str] = [
-        "",
-        "\U0001faf6",  # 🫶
-        "\U00002764",  # ❤ red heart
-    ]
+    emojis: str = get_all_emojis()
+    if not emojis:
+        # Every emoji came out empty, so force a non-empty one instead of drawing them all again
+        emojis_list = random.choice(_EMOJI_TABLE)[0]
+        emojis = emojis_list[random.randrange(1, len(emojis_list))]
 
-    def get_emoji(emojis: list[str], p: float) -> str:
-        """Gets a random emoji from a list based on a specified probability.
-
-        This function selects an emoji from the provided list using a random selection method that
-        takes into account the specified probability. The probability influences the likelihood of
-        each emoji being chosen, allowing for customized emoji selection.
-
-        Args:
-            emojis (list[str]): The list of emojis to choose from.
-            p (float): The probability factor that influences the selection of the emoji. Refer to
-                `utils.random.low_random` documentation.
-
-        Returns:
-            str: The randomly selected emoji from the list.
-        """
-        return emojis[low_random(1, len(emojis), p) - 1]
-
-    def get_all_emojis() -> str:
-        """Get a random text made of emojis.
-
-        This function generates a string composed of randomly selected emojis from predefined lists.
-        It combines multiple emojis to create a fun and varied emoji text output.
-
-        Returns:
-            str: The random text made of emojis.
-        """
-        return (
-            get_emoji(emoji1, 3.5)
-            + get_emoji(emoji2, 5)
-            + get_emoji(emoji3, 4)
-            + get_emoji(emoji4, 3)
-            + get_emoji(emoji5, 1.3)
-            + get_emoji(emoji6, 2)
-        )
-
-    emojis: str = ""
-    while not emojis:
-        emojis = get_all_emojis()
-
-    return f"{greeting} {emojis}"
+    return greeting + " " + emojis
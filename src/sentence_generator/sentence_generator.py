@@ -6,10 +6,14 @@ assembling sentences from a list of tokens. These components work together to al
 dynamic sentence generation based on defined token relationships and selection algorithms.
 """
 
-from collections.abc import Callable
-from random import choice
+from collections.abc import Callable, Sequence
+from math import lcm
+from random import choice, randrange
 from typing import Union
 
+# Largest number of sentences enumerated for a static token, so wide graphs are not expanded
+MAX_STATIC_SENTENCES = 10_000
+
 
 class CustomGeneratedText:
     """Represents a custom generated text.
@@ -19,6 +23,8 @@ class CustomGeneratedText:
     the generated text as a string.
     """
 
+    __slots__ = ("generator",)
+
     def __init__(self, generator: Callable[[], str]):
         """Creates a custom generated text class.
 
@@ -31,7 +37,7 @@ class CustomGeneratedText:
         """
         self.generator = generator
 
-    def __repr__(self) -> str:
+    def __str__(self) -> str:
         """Return the generated text as a string.
 
         This method calls the generator function and returns the resulting string.
@@ -39,7 +45,18 @@ class CustomGeneratedText:
         Returns:
             str: The generated text from the generator function.
         """
-        return str(self.generator())
+        return self.generator()
+
+    def __call__(self) -> str:
+        """Generate a new text.
+
+        This method calls the generator function directly, so callers can get the generated text
+        without going through `str`.
+
+        Returns:
+            str: The generated text from the generator function.
+        """
+        return self.generator()
 
 
 class Token:
@@ -50,10 +67,21 @@ class Token:
     for the construction of dynamic and flexible sentence structures.
     """
 
+    __slots__ = (
+        "_value",
+        "_static",
+        "_gen",
+        "pick_next",
+        "next_tokens",
+        "_next_tuple",
+        "_n_next",
+        "_fast_pick",
+    )
+
     def __init__(
         self,
         value: str | CustomGeneratedText,
-        pick_next: Callable[[list["Token"]], "Token"] = choice,
+        pick_next: Callable[[Sequence["Token"]], "Token"] = choice,
     ):
         """Creates a token of a sentence.
 
@@ -64,13 +92,35 @@ class Token:
         Args:
             value (str | CustomGeneratedText): The value of the token, which can be a string or a
                 custom generated text.
-            pick_next (Callable[[list[Token]], Token], optional): Algorithm to pick the next token
-                after this one. Defaults to random.choice.
+            pick_next (Callable[[Sequence[Token]], Token], optional): Algorithm to pick the next
+                token after this one. Defaults to random.choice.
         """
         super().__init__()
         self.value = value
         self.pick_next = pick_next
         self.next_tokens: list[Token] = []
+        self.finalize()
+
+    @property
+    def value(self) -> str | CustomGeneratedText:
+        """The value of the token, which can be a string or a custom generated text.
+
+        Setting it also caches how the value is evaluated: the string itself for static values, and
+        a function returning the value, which is the generator function for custom generated texts,
+        so evaluating the token does not go through `str` and `CustomGeneratedText.__str__` every
+        time.
+        """
+        return self._value
+
+    @value.setter
+    def value(self, value: str | CustomGeneratedText):
+        self._value = value
+        if isinstance(value, CustomGeneratedText):
+            self._static: str | None = None
+            self._gen: Callable[[], str] = value.generator
+        else:
+            self._static = str(value)
+            self._gen = self._static.__str__
 
     def eval(self) -> str:
         """Evaluate this token.
@@ -79,13 +129,85 @@ class Token:
         available. It constructs a string representation of the token and its subsequent tokens,
         forming part of a complete sentence.
 
+        The chain of tokens is walked iteratively and the non-empty values are joined once with
+        single spaces, so no Python frame is created per token.
+
         Returns:
             str: The evaluated string representation of the token and its next tokens.
         """
-        left = str(self.value)
-        next_token = self.get_next_token()
-        right = "" if next_token is None else next_token.eval()
-        return f"{left}{' ' if left != '' and right != '' else ''}{right}"
+        parts: list[str] = []
+        self._collect(parts)
+        return " ".join(part for part in parts if part)
+
+    def _collect(self, parts: list[str]):
+        """Collect the values of this token and of the next tokens picked after it.
+
+        This method walks the chain of tokens iteratively, starting at this one, and appends the
+        string value of each visited token to `parts`. Empty values are appended too, so callers
+        are expected to filter them out when joining.
+
+        Args:
+            parts (list[str]): The list to which the values of the visited tokens are appended.
+        """
+        node: Token | None = self
+        while node is not None:
+            parts.append(node._static if node._static is not None else node._gen())
+            node = node.get_next_token()
+
+    def finalize(self):
+        """Precompute the data used to pick the next token.
+
+        This method freezes the possible next tokens into a tuple, caches its length and checks
+        whether the default selection algorithm is used, so `get_next_token` can pick a uniformly
+        random token by indexing without going through `random.choice`. It is called whenever next
+        tokens are added, and must be called again if `next_tokens` or `pick_next` are modified
+        directly.
+        """
+        self._next_tuple: tuple[Token, ...] = tuple(self.next_tokens)
+        self._n_next = len(self._next_tuple)
+        self._fast_pick = self.pick_next is choice
+
+    def enumerate_static(self) -> list[str] | None:
+        """Enumerate every sentence that can be evaluated from this token.
+
+        This method lists all the sentences of the chain of tokens starting at this one, as long as
+        every reachable token has a static value and picks its next token with the default
+        selection algorithm. Each sentence is repeated as many times as needed so that picking a
+        uniformly random element of the list has the same distribution as evaluating the token.
+
+        Returns:
+            list[str] | None: The sentences that can be evaluated from this token, or None if any
+                reachable token has a custom generated value, a custom selection algorithm or is
+                part of a cycle, or if the list would be longer than `MAX_STATIC_SENTENCES`.
+        """
+        visiting: set[Token] = set()
+
+        def enumerate_from(token: Token) -> list[str] | None:
+            if token._static is None or not token._fast_pick or token in visiting:
+                return None
+
+            if token._n_next == 0:
+                return [token._static]
+
+            visiting.add(token)
+            maybe_children = [enumerate_from(next_token) for next_token in token._next_tuple]
+            visiting.discard(token)
+            children = [child for child in maybe_children if child is not None]
+            if len(children) < len(maybe_children):
+                return None
+
+            # Every child must weigh the same, so their sentences are replicated to a common length
+            size = lcm(*map(len, children))
+            if size * len(children) > MAX_STATIC_SENTENCES:
+                return None
+
+            return [
+                " ".join(part for part in (token._static, sentence) if part)
+                for child in children
+                for sentence in child * (size // len(child))
+            ]
+
+        return enumerate_from(self)
 
     def get_next_token(self) -> Union["Token", None]:
         """Gets the next token, if any.
@@ -96,7 +218,13 @@ class Token:
         Returns:
             Union[Token, None]: The next token, if available; otherwise, None.
         """
-        return None if len(self.next_tokens) == 0 else self.pick_next(self.next_tokens)
+        if self._n_next == 0:
+            return None
+
+        if self._fast_pick:
+            return self._next_tuple[randrange(self._n_next)]
+
+        return self.pick_next(self._next_tuple)
 
     def add_next_token(self, next_token: "Token") -> "Token":
         """Adds a possible next token to this one.
@@ -111,6 +239,7 @@ class Token:
             Token: Returns itself, allowing for method chaining in a builder design pattern.
         """
         self.next_tokens.append(next_token)
+        self.finalize()
         return self
 
     def add_next_tokens(self, *next_tokens: "Token") -> "Token":
@@ -126,9 +255,30 @@ class Token:
             Token: Returns itself, allowing for method chaining in a builder design pattern.
         """
         self.next_tokens.extend(next_tokens)
+        self.finalize()
         return self
 
 
+def _id_picker(
+    pick: Callable[[list[Token]], Token], tokens: list[Token], id_of: dict[Token, int]
+) -> Callable[[Sequence[int]], int]:
+    """Adapt a selection algorithm of tokens to pick token ids.
+
+    The returned function ignores the ids it is given: it applies the selection algorithm to the
+    tokens those ids were assigned to, and returns the id of the picked token, so custom selection
+    algorithms keep being called with tokens after compiling.
+
+    Args:
+        pick (Callable[[list[Token]], Token]): The selection algorithm of tokens.
+        tokens (list[Token]): The tokens to pick from.
+        id_of (dict[Token, int]): The id assigned to each token.
+
+    Returns:
+        Callable[[Sequence[int]], int]: The selection algorithm of token ids.
+    """
+    return lambda _: id_of[pick(tokens)]
+
+
 class SentenceGenerator:
     """Represents a sentence generator algorithm class.
 
@@ -138,6 +288,18 @@ class SentenceGenerator:
     generation.
     """
 
+    __slots__ = (
+        "initial_tokens",
+        "pick_root",
+        "_compiled",
+        "_values",
+        "_trans",
+        "_pickers",
+        "_roots",
+        "_pick_root",
+        "_static_sentences",
+    )
+
     def __init__(
         self,
         initial_tokens: list[Token],
@@ -157,6 +319,68 @@ class SentenceGenerator:
         """
         self.initial_tokens = initial_tokens
         self.pick_root = pick_root
+        self._compiled = False
+
+    def compile(self) -> "SentenceGenerator":
+        """Compile the graph of tokens into flat tables indexed by token id.
+
+        This method assigns an integer id to every token reachable from the initial tokens, in
+        breadth-first order, and stores for each id its evaluated value (the static string or the
+        generator function), the ids of its possible next tokens and its selection algorithm, if it
+        is not the default one. Custom selection algorithms, including `pick_root`, are still called
+        with the tokens, and the picked token is mapped back to its id, so they keep picking with
+        the same distribution.
+        The sentences of the initial tokens whose chains are entirely static are also enumerated
+        once, so they are picked from a flat tuple instead of walking their tokens.
+        After compiling, `eval` walks these tables instead of the tokens themselves. It must be
+        called again if the tokens are modified afterwards.
+
+        Returns:
+            SentenceGenerator: Returns itself, allowing for method chaining.
+        """
+        id_of: dict[Token, int] = {}
+        order: list[Token] = []
+        for token in self.initial_tokens:
+            if token not in id_of:
+                id_of[token] = len(order)
+                order.append(token)
+
+        i = 0
+        while i < len(order):
+            for next_token in order[i].next_tokens:
+                if next_token not in id_of:
+                    id_of[next_token] = len(order)
+                    order.append(next_token)
+            i += 1
+
+        self._values: list[str | Callable[[], str]] = [
+            token._static if token._static is not None else token._gen for token in order
+        ]
+        self._trans: list[tuple[int, ...]] = [
+            tuple(id_of[next_token] for next_token in token.next_tokens) for token in order
+        ]
+        self._pickers: list[Callable[[Sequence[int]], int] | None] = [
+            (
+                None
+                if token.pick_next is choice
+                else _id_picker(token.pick_next, list(token.next_tokens), id_of)
+            )
+            for token in order
+        ]
+        self._roots: tuple[int, ...] = tuple(id_of[token] for token in self.initial_tokens)
+        self._pick_root: Callable[[Sequence[int]], int] | None = (
+            None
+            if self.pick_root is choice
+            else _id_picker(self.pick_root, self.initial_tokens, id_of)
+        )
+        self._static_sentences: dict[int, tuple[str, ...]] = {}
+        for token in self.initial_tokens:
+            static_sentences = token.enumerate_static()
+            if static_sentences is not None:
+                self._static_sentences[id_of[token]] = tuple(static_sentences)
+
+        self._compiled = True
+        return self
 
     def eval(self) -> str:
         """Evaluate this sentence generator.
@@ -165,7 +389,61 @@ class SentenceGenerator:
         with its subsequent tokens. It constructs the final string representation of the generated
         sentence.
 
+        The values of the visited tokens are collected into a list and joined once, skipping the
+        empty ones, instead of building intermediate strings at every token. If the generator was
+        compiled, the walk is a loop over token ids using the tables built by `compile`.
+
         Returns:
             str: The generated sentence based on the initial tokens and their relationships.
         """
-        return "" if len(self.initial_tokens) == 0 else self.pick_root(self.initial_tokens).eval()
+        if len(self.initial_tokens) == 0:
+            return ""
+
+        if self._compiled:
+            return self.eval_batch(1)[0]
+
+        parts: list[str] = []
+        self.pick_root(self.initial_tokens)._collect(parts)
+        return " ".join(part for part in parts if part)
+
+    def eval_batch(self, n: int) -> list[str]:
+        """Evaluate this sentence generator several times.
+
+        This method generates `n` sentences at once. If the generator was compiled, the tables built
+        by `compile` and the random functions are looked up once for the whole batch, and each
+        sentence is generated by a loop over token ids; otherwise, `eval` is called `n` times.
+
+        Args:
+            n (int): The number of sentences to be generated.
+
+        Returns:
+            list[str]: The generated sentences.
+        """
+        if not self._compiled or len(self.initial_tokens) == 0:
+            return [self.eval() for _ in range(n)]
+
+        values, trans, pickers = self._values, self._trans, self._pickers
+        roots, pick_root, rand = self._roots, self._pick_root, randrange
+        static_sentences = self._static_sentences
+        sentences: list[str] = []
+        for _ in range(n):
+            i = roots[rand(len(roots))] if pick_root is None else pick_root(roots)
+            static = static_sentences.get(i)
+            if static is not None:
+                sentences.append(static[rand(len(static))])
+                continue
+
+            parts: list[str] = []
+            while True:
+                value = values[i]
+                parts.append(value if isinstance(value, str) else value())
+                next_ids = trans[i]
+                if not next_ids:
+                    break
+
+                picker = pickers[i]
+                i = next_ids[rand(len(next_ids))] if picker is None else picker(next_ids)
+
+            sentences.append(" ".join(part for part in parts if part))
+
+        return sentences
@@ -0,0 +1,59 @@
+"""This module contains the logging configuration of the Telegram Auto Texter application.
+
+It includes the `LOGGING_CONFIG` dictionary, which describes the loggers, handlers and formatters
+used by the application, and the `setup_logging` function, which applies it once. Keeping the
+configuration in code avoids reading and parsing a configuration file from disk on every start.
+"""
+
+import logging.config
+
+_CONFIGURED = False
+
+LOGGING_CONFIG: dict = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "simple": {
+            "format": "%(asctime)s - %(levelname)-8s > %(message)s",
+        },
+        "complex": {
+            "format": "%(asctime)s - %(levelname)-8s > [file = %(filename)s ; "
+            "func = %(funcName)s ; line = %(lineno)d] > %(message)s",
+        },
+    },
+    "handlers": {
+        "stream": {
+            "class": "logging.StreamHandler",
+            "level": "INFO",
+            "formatter": "simple",
+            "stream": "ext://sys.stdout",
+        },
+        "file": {
+            "class": "logging.FileHandler",
+            "level": "DEBUG",
+            "formatter": "complex",
+            "filename": "user_bot.log",
+        },
+    },
+    "root": {
+        "level": "NOTSET",
+        "handlers": ["stream", "file"],
+    },
+}
+
+
+def setup_logging():
+    """Configures the logging of the application.
+
+    This function applies `LOGGING_CONFIG` through `logging.config.dictConfig`, sending INFO and
+    higher messages to the standard output and every message to the `user_bot.log` file.
+
+    The configuration is only applied the first time this function is called, so every module can
+    call it on import without replacing the handlers already in place.
+    """
+    global _CONFIGURED
+    if _CONFIGURED:
+        return
+
+    logging.config.dictConfig(LOGGING_CONFIG)
+    _CONFIGURED = True
@@ -1,13 +1,15 @@
 """This module contains utility functions for generating random values.
 
 It includes the `low_random` function, which generates a low-biased random integer within a
-specified range, and the `random_time` function, which generates a random time duration between two
-specified time intervals. These functions can be used to introduce variability and randomness in
+specified range, and the `random_time` function, which generates a random time, in seconds, between
+two specified times. These functions can be used to introduce variability and randomness in
 applications requiring random number generation.
 """
 
 import random
-from datetime import timedelta
+
+_random = random.random
+_randrange = random.randrange
 
 
 def low_random(a: int, b: int, p: float = 2) -> int:
@@ -20,6 +22,9 @@ def low_random(a: int, b: int, p: float = 2) -> int:
     making it more likely to return values closer to the lower bound, upper bound or uniform
     distribution according to the parameter p.
 
+    The most common powers are special-cased: p = 2 squares the random number with a
+    multiplication and p = 1 uses it as is, instead of going through the generic power operation.
+
     Args:
         a (int): The lower bound of the random integer range.
         b (int): The upper bound of the random integer range.
@@ -33,23 +38,29 @@ def low_random(a: int, b: int, p: float = 2) -> int:
     Returns:
         int: A low-biased random integer within the specified range [a, b].
     """
-    return a + int((b - a + 1) * (random.random() ** p))
+    r = _random()
+    if p == 2:
+        r *= r
+    elif p != 1:
+        r **= p
+
+    return a + int((b - a + 1) * r)
 
 
-def random_time(start: timedelta, end: timedelta) -> timedelta:
-    """Generates a random time duration between two specified time intervals.
+def random_time(start: int, end: int) -> int:
+    """Generates a random time between two specified times.
 
-    This function returns a random timedelta that falls within the range defined by the start and
-    end parameters.
+    This function returns a random number of whole seconds that falls within the range defined by
+    the start and end parameters, so times of day can be handled as plain integers.
 
     The generated random time is inclusive on both the start and end time, allowing for variability
     in time calculations.
 
     Args:
-        start (timedelta): The lower bound of the time interval.
-        end (timedelta): The upper bound of the time interval.
+        start (int): The lower bound of the time interval, in seconds.
+        end (int): The upper bound of the time interval, in seconds.
 
     Returns:
-        timedelta: A random timedelta representing a duration within the specified range.
+        int: A random number of seconds within the specified range.
     """
-    return timedelta(seconds=random.randint(int(start.total_seconds()), int(end.total_seconds())))
+    return _randrange(start, end + 1)
@@ -2,66 +2,161 @@
 
 It includes functions for sending morning greetings and afternoon messages, media items, and
 reminders, as well as managing the state of sent items. The module utilizes YAML files for
-configuration and data storage, and it integrates with the APScheduler for scheduling tasks.
+configuration and data storage, and it schedules its tasks directly on the asyncio event loop.
 """
 
 import asyncio
-import bisect
+import functools
+import json
 import logging
-import logging.config
+import os
 import random
-from datetime import datetime, timedelta
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import dataclass, field, replace
+from datetime import datetime, time, timedelta
 from pathlib import Path
 
 import yaml
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from telethon import TelegramClient, events
+from telethon.errors import FloodWaitError
 from telethon.tl.custom.message import Message
-from telethon.tl.types import InputDocument
+from telethon.tl.types import InputDocument, TypeInputPeer
 
 from src.sentence_generator import morning
+from src.utils.logging_config import setup_logging
 from src.utils.random import random_time
 
-logging.config.fileConfig("logging.conf")
+_Loader: type[yaml.SafeLoader] | type[yaml.CSafeLoader]
+try:
+    _Loader = yaml.CSafeLoader
+except AttributeError:  # PyYAML was built without libyaml
+    _Loader = yaml.SafeLoader
+
+try:
+    # Telethon uses it automatically, if installed, to encrypt and decrypt the uploaded media
+    import cryptg  # noqa: F401
+except ImportError:
+    cryptg = None
+
+setup_logging()
+log = logging.getLogger(__name__)
+
+if cryptg is None:
+    log.warning("cryptg is not installed, Telethon will encrypt the media in pure Python.")
 
 DATA_PATH = Path("src/data")
 MEDIA_PATH = DATA_PATH / "media"
 MEDIA_YAML_PATH = DATA_PATH / "media.yaml"
 REGISTER_YAML_PATH = DATA_PATH / "register.yaml"
+REGISTER_DB_PATH = DATA_PATH / "register.sqlite"
 STICKERS_YAML_PATH = DATA_PATH / "stickers.yaml"
 TELEGRAM_CONFIG_PATH = DATA_PATH / "telegram_config.yaml"
+YAML_CACHE_SIZE = 100
+ONE_DAY = timedelta(days=1)
+PILL_REMINDER_MESSAGE = "💊 Amorcito, recuerda tomarte la píldora a las 10. Te amo ❤️"
+# Shortest wait, in seconds, between two pill reminders, so they never get rate limited by Telegram
+MIN_PILL_REMINDER_WAITING_TIME = 2
+
+# Set when the user asks to stop the pill reminders of the day, waking the reminder loop up
+stop_pill_event = asyncio.Event()
+scheduled_jobs: set[asyncio.Task] = set()
+register_db: sqlite3.Connection | None = None
+# The register is used from worker threads, so every access to it is serialized
+register_lock = threading.RLock()
+user_configs: dict[str, "UserConfig"] | None = None
+# Ready to send sticker documents by UID, along with the file reference text they were built from.
+sticker_documents: dict[int, tuple[str, InputDocument]] = {}
+# Parsed YAML files by path and encoding, along with the modification time and size of the file
+# they were parsed from, from the least to the most recently used.
+_yaml_cache: OrderedDict[tuple[Path, str], tuple[tuple[int, int], dict]] = OrderedDict()
+# The YAML cache is used from worker threads, so every access to it is serialized
+yaml_cache_lock = threading.Lock()
+# Number of items by entry of the YAML files, along with the modification time and size of the
+# file they were counted from.
+_entry_totals: dict[Path, tuple[tuple[int, int], dict[str, int]]] = {}
+# Number of unique IDs in the register by entry, loaded from the register database when needed.
+used_counts: dict[str, int] | None = None
+# Items not sent yet by entry, along with the modification time of the YAML file they come from.
+available_items: dict[str, tuple[int, list[dict]]] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class UserConfig:
+    """Configuration of a user, as defined in the Telegram configuration file.
+
+    The times are already converted to seconds since midnight, and are None if they are not
+    configured for the user. The peer is the input peer of the chat, resolved by `get_peer` the
+    first time it is needed.
+    """
 
-next_greeting_time: datetime = datetime.now()
-next_afternoon_media_time: datetime = datetime.now()
-keep_sending_pill_reminder = False
+    chat_id: int | str | None = None
+    morning_start: int | None = None
+    morning_end: int | None = None
+    afternoon_start: int | None = None
+    afternoon_end: int | None = None
+    pills_reminder_time: int | None = None
+    peer: TypeInputPeer | None = None
 
 
-class CustomYamlDumper(yaml.Dumper):
-    """Custom YAML dumper that modifies the indentation behavior.
+@dataclass(slots=True)
+class ScheduleState:
+    """Times at which the next scheduled messages are sent.
 
-    This class extends the default YAML dumper to ensure that the indentation is always increased
-    for block styles, making the output more readable and consistent. It overrides the
-    `increase_indent` method to customize the indentation settings.
+    The sending loops update the single instance, `schedule_state`, in place, and the command
+    handlers read it, so the loops do not rebind module globals on every run. The reply text of each
+    info command is formatted once, whenever its time is set, so the handlers reply with a
+    ready-made string.
     """
 
-    def increase_indent(self, flow: bool = False, *args, **kwargs):
-        """Increase the indentation level for YAML output.
+    next_greeting_time: datetime = field(default_factory=datetime.now)
+    next_afternoon_media_time: datetime = field(default_factory=datetime.now)
+    next_greeting_info: str = field(init=False)
+    next_afternoon_media_info: str = field(init=False)
 
-        This method modifies the behavior of indentation to ensure that it is not indentless,
-        providing a clearer structure in the generated YAML.
+    def __post_init__(self):
+        """Formats the reply text of the initial times."""
+        self.set_next_greeting_time(self.next_greeting_time)
+        self.set_next_afternoon_media_time(self.next_afternoon_media_time)
+
+    def set_next_greeting_time(self, dt: datetime):
+        """Sets the time of the next greeting and formats its reply text.
 
         Args:
-            flow (bool, optional): Indicates whether the indentation is for flow style. Defaults to
-                False.
+            dt (datetime): The time at which the next greeting is sent.
         """
-        return super().increase_indent(flow=flow, indentless=False)
+        self.next_greeting_time = dt
+        self.next_greeting_info = f"Next greeting at {dt}"
 
+    def set_next_afternoon_media_time(self, dt: datetime):
+        """Sets the time of the next afternoon media item and formats its reply text.
 
-def read_yaml(path: Path, *, encoding: str = "utf-8") -> dict:
-    """Reads a YAML file and returns its contents as a dictionary.
+        Args:
+            dt (datetime): The time at which the next afternoon media item is sent.
+        """
+        self.next_afternoon_media_time = dt
+        self.next_afternoon_media_info = f"Next media at {dt}"
 
-    This function loads the specified YAML file from the given path and parses its content into
-    a Python dictionary, allowing for easy access to configuration settings.
+
+schedule_state = ScheduleState()
+
+
+def read_yaml_ro(path: Path, *, encoding: str = "utf-8") -> dict:
+    """Reads a YAML file and returns its cached contents, which must not be modified.
+
+    The file is parsed with the libyaml based loader when PyYAML was built with it. The parsed
+    content is cached along with the modification time and size of the file, so the file is only
+    parsed again when it changes. The cached content itself is returned, without copying it, so
+    every caller only reads it. Up to `YAML_CACHE_SIZE` files are cached, evicting the least
+    recently used. The cache is only accessed while holding `yaml_cache_lock`, so files can be read
+    from worker threads.
+
+    Parsing JSON is much faster than parsing YAML, so the first time a file is parsed its content is
+    also written to a JSON sidecar file, which is loaded instead of the YAML file, even after a
+    restart, while it is not older than it.
 
     Args:
         path (Path): The path to the YAML file to be read.
@@ -69,120 +164,537 @@ def read_yaml(path: Path, *, encoding: str = "utf-8") -> dict:
             "utf-8".
 
     Returns:
-        dict: A dictionary containing the contents of the YAML file.
+        dict: A dictionary containing the contents of the YAML file, shared with the cache.
 
     Raises:
         FileNotFoundError: If the specified YAML file does not exist.
         yaml.YAMLError: If there is an error parsing the YAML file.
     """
-    logging.debug("Running method `read_yaml`...")
     try:
-        with open(path, encoding=encoding) as f:
-            data = yaml.safe_load(f)
-            logging.info("YAML file read successfully.")
-            return data
+        key, stamp = (path, encoding), get_file_stamp(path)
+        with yaml_cache_lock:
+            cached = _yaml_cache.get(key)
+            if cached is not None and cached[0] == stamp:
+                log.debug("YAML file %s is unchanged, using the cached content.", path)
+                _yaml_cache.move_to_end(key)
+                return cached[1]
 
-    except FileNotFoundError as e:
-        logging.error("YAML file not found: %s", path)
-        raise e
+        data = read_json_sidecar(path, encoding, stamp[0])
+        if data is None:
+            # The whole file is handed to the parser at once, instead of being read in chunks
+            data = yaml.load(path.read_text(encoding=encoding), Loader=_Loader)
+            log.info("YAML file read successfully.")
 
-    except yaml.YAMLError as e:
-        logging.error("Error parsing YAML file at %s: %s", path, e)
-        raise e
+            write_json_sidecar(data, path, encoding)
+
+        cache_yaml(key, stamp, data)
+        return data
 
     except Exception as e:
-        logging.error("Error while reading YAML file at %s: %s", path, e)
-        raise e
+        # The representation of the error tells apart missing files and YAML parsing errors
+        log.error("Error while reading YAML file at %s: %r", path, e)
+        raise
+
+
+def get_file_stamp(path: Path) -> tuple[int, int]:
+    """Returns the modification time, in nanoseconds, and the size of a file.
 
-    logging.debug("Method `read_yaml` finished.")
+    Args:
+        path (Path): The path to the file.
+
+    Returns:
+        tuple[int, int]: The modification time and the size of the file.
 
+    Raises:
+        FileNotFoundError: If the specified file does not exist.
+    """
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
 
-def save_yaml(data: dict, path: Path, *, encoding: str = "utf-8"):
-    """Saves a Python dictionary as a YAML file.
 
-    This function serializes the provided dictionary and writes it to the specified file path
-    in YAML format, allowing for easy storage and retrieval of structured data.
+def get_json_sidecar_path(path: Path, encoding: str) -> Path:
+    """Returns the path to the JSON sidecar file of a YAML file read with the specified encoding.
 
     Args:
-        data (dict): The Python object to be saved as YAML.
-        path (Path): The path to the YAML file where the data will be saved.
-        encoding (str, optional): The character encoding to use when writing the file. Defaults to
-            "utf-8".
+        path (Path): The path to the YAML file.
+        encoding (str): The character encoding the YAML file is read with.
+
+    Returns:
+        Path: The path to the JSON sidecar file.
     """
-    logging.debug("Running method `save_yaml`...")
+    return path.with_name(f"{path.name}.{encoding}.json")
+
+
+def read_json_sidecar(path: Path, encoding: str, mtime: int) -> dict | None:
+    """Reads the JSON sidecar file of a YAML file, if it is up to date.
+
+    Args:
+        path (Path): The path to the YAML file.
+        encoding (str): The character encoding the YAML file is read with.
+        mtime (int): The modification time of the YAML file, in nanoseconds.
+
+    Returns:
+        dict | None: The content of the YAML file, or None if the sidecar file does not exist, is
+            older than the YAML file or cannot be read.
+    """
+    sidecar_path = get_json_sidecar_path(path, encoding)
     try:
-        with open(path, "w", encoding=encoding) as f:
-            yaml.dump(data, f, Dumper=CustomYamlDumper)
-            logging.info("Data saved successfully to %s", path)
+        if sidecar_path.stat().st_mtime_ns < mtime:
+            return None
 
-    except Exception as e:
-        logging.error("Error while saving data to YAML file at %s: %s", path, e)
+        with open(sidecar_path, encoding="utf-8") as f:
+            data = json.load(f)
+            log.debug("JSON sidecar file %s read successfully.", sidecar_path)
+            return data
+
+    except FileNotFoundError:
+        return None
+
+    except (OSError, ValueError) as e:
+        log.warning("Error while reading JSON sidecar file at %s: %s", sidecar_path, e)
+        return None
+
+
+def write_json_sidecar(data: dict, path: Path, encoding: str):
+    """Writes the content of a YAML file to its JSON sidecar file.
+
+    The sidecar file is only written if JSON can represent the content exactly, e.g. it is not
+    written if a mapping has keys that are not strings. It is written to a temporary file that then
+    replaces the sidecar file, so it is never left half written. Any error is logged and ignored, as
+    the YAML file can always be parsed instead.
+
+    Args:
+        data (dict): The content of the YAML file.
+        path (Path): The path to the YAML file.
+        encoding (str): The character encoding the YAML file was read with.
+    """
+    sidecar_path = get_json_sidecar_path(path, encoding)
+    try:
+        text = json.dumps(data)
+        if json.loads(text) != data:
+            log.debug("JSON cannot represent the content of %s, skipping its sidecar.", path)
+            return
+
+        tmp_path = sidecar_path.with_name(f"{sidecar_path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+        os.replace(tmp_path, sidecar_path)
+        log.debug("JSON sidecar file %s written successfully.", sidecar_path)
+
+    except (OSError, TypeError, ValueError) as e:
+        log.warning("Error while writing JSON sidecar file at %s: %s", sidecar_path, e)
+
+
+def cache_yaml(key: tuple[Path, str], stamp: tuple[int, int], data: dict):
+    """Stores the content of a YAML file in the cache used by `read_yaml_ro`.
+
+    If the cache is full, the least recently used file is evicted. The cache is only changed while
+    holding `yaml_cache_lock`, so it can be used from worker threads.
+
+    Args:
+        key (tuple[Path, str]): The path to the YAML file and the encoding it was read with.
+        stamp (tuple[int, int]): The modification time and size of the file, as returned by
+            `get_file_stamp`.
+        data (dict): The content of the YAML file, which must not be modified afterwards.
+    """
+    with yaml_cache_lock:
+        _yaml_cache[key] = (stamp, data)
+        _yaml_cache.move_to_end(key)
+        if len(_yaml_cache) > YAML_CACHE_SIZE:
+            _yaml_cache.popitem(last=False)
+
+
+def get_register_db() -> sqlite3.Connection:
+    """Returns the connection to the register database, opening it if needed.
+
+    The register keeps the unique IDs of the items already sent for every entry in the `used` table
+    of a SQLite database, so marking an item as used does not rewrite the whole register. The first
+    time the database is created, the content of the legacy `register.yaml` file, if any, is
+    migrated into it.
+
+    Returns:
+        sqlite3.Connection: The connection to the register database.
+
+    Raises:
+        sqlite3.Error: If there is an error opening or migrating the register database.
+    """
+    global register_db
+    if register_db is not None:
+        return register_db
+
+    with register_lock:
+        if register_db is None:
+            register_db = open_register_db()
+
+    return register_db
+
+
+def open_register_db() -> sqlite3.Connection:
+    """Opens the register database, creating it if needed.
+
+    The connection can be used from any thread, as long as the accesses are serialized with
+    `register_lock`. The database uses write-ahead logging with normal synchronization, so marking
+    an item as used appends to the log instead of syncing the database file on every commit. The
+    log is merged back into the database file when the connection is closed by
+    `close_register_db`.
+
+    Returns:
+        sqlite3.Connection: The connection to the register database.
+
+    Raises:
+        sqlite3.Error: If there is an error opening or migrating the register database.
+    """
+    try:
+        db = sqlite3.connect(REGISTER_DB_PATH, check_same_thread=False)
+        db.execute("PRAGMA journal_mode = WAL")
+        db.execute("PRAGMA synchronous = NORMAL")
+        created = db.execute("SELECT 1 FROM sqlite_master WHERE name = 'used'").fetchone()
+        if created is None:
+            log.info("Creating the register database at %s...", REGISTER_DB_PATH)
+            # The table is created and filled in a single transaction, so a failed migration is
+            # attempted again on the next start
+            db.execute("BEGIN")
+            with db:
+                db.execute(
+                    "CREATE TABLE used "
+                    "(entry TEXT NOT NULL, uid INTEGER NOT NULL, PRIMARY KEY (entry, uid))"
+                )
+                if REGISTER_YAML_PATH.exists():
+                    log.info("Migrating the register from %s...", REGISTER_YAML_PATH)
+                    register = read_yaml_ro(REGISTER_YAML_PATH) or {}
+                    db.executemany(
+                        "INSERT OR IGNORE INTO used VALUES (?, ?)",
+                        [(entry, uid) for entry, uids in register.items() for uid in uids],
+                    )
+                    log.info("Register migrated successfully to %s", REGISTER_DB_PATH)
+
+    except sqlite3.Error as e:
+        log.error("Error while opening the register database at %s: %s", REGISTER_DB_PATH, e)
         raise e
 
-    logging.debug("Method `save_yaml` finished.")
+    return db
+
+
+def close_register_db():
+    """Closes the connection to the register database, if it is open.
 
+    Closing the connection merges the write-ahead log into the database file, so the register is
+    fully contained in `register.sqlite` once the user bot stops.
+    """
+    global register_db
+    with register_lock:
+        if register_db is not None:
+            register_db.close()
+            register_db = None
+            log.info("Register database closed.")
 
-def filter_by_register(data: dict | list, register: list["int | str"], *, key: str = "uid") -> list:
-    """Filters the data to exclude items present in the register.
 
-    This function checks the provided data against a list of identifiers in the register and
-    returns a new list containing only those items that are not in the register. It allows for
-    flexible filtering based on a specified key.
+def get_used_uids(entry: str) -> set[int]:
+    """Returns the unique IDs marked as used for the specified entry.
 
     Args:
-        data (dict | list): The data to be filtered, which can be a dictionary or a list.
-        register (list[int | str]): A list of identifiers to filter out from the data.
-        key (str, optional): The key used to identify items in the data for filtering. Defaults to
-            "uid".
+        entry (str): The key in the register of the entry to be looked up.
 
     Returns:
-        list: A list of items from the data that are not present in the register.
+        set[int]: The unique IDs of the items of the entry already sent.
+
+    Raises:
+        sqlite3.Error: If there is an error querying the register database.
     """
-    logging.debug("Running method `filter_by_register`...")
-    logging.info(
-        "Starting filtering process with data %s, register %s and key %s.", data, register, key
-    )
-    _register = set(register)
-    filtered_data = [d for d in data if (d if key is None else d[key]) not in _register]
-    logging.debug("Method `filter_by_register` finished.")
-    return filtered_data
+    with register_lock:
+        rows = get_register_db().execute("SELECT uid FROM used WHERE entry = ?", (entry,))
+        return {uid for (uid,) in rows}
+
+
+def get_used_counts() -> dict[str, int]:
+    """Returns the number of unique IDs marked as used for every entry.
+
+    The counts are loaded from the register database the first time they are needed, and then kept
+    up to date by `set_as_used_batch` and `get_available_items`. Callers must hold `register_lock`
+    while using them and must not modify them.
+
+    Returns:
+        dict[str, int]: The number of items already sent by entry.
+
+    Raises:
+        sqlite3.Error: If there is an error querying the register database.
+    """
+    global used_counts
+    with register_lock:
+        if used_counts is None:
+            rows = get_register_db().execute("SELECT entry, COUNT(*) FROM used GROUP BY entry")
+            used_counts = dict(rows)
+
+        return used_counts
+
+
+def get_entry_totals(db_yaml: Path) -> dict[str, int]:
+    """Returns the number of items of every entry of a YAML file.
+
+    The counts are cached along with the modification time and size of the file, so they are only
+    computed again when it changes, without copying the content of the file. The cache is used from
+    worker threads, so it is only used while holding `register_lock`.
+
+    Args:
+        db_yaml (Path): The path to the YAML file containing the database entries.
+
+    Returns:
+        dict[str, int]: The number of items by entry.
 
+    Raises:
+        FileNotFoundError: If the specified YAML file cannot be found.
+        yaml.YAMLError: If there is an error parsing the YAML file.
+    """
+    stamp = get_file_stamp(db_yaml)
+    with register_lock:
+        cached = _entry_totals.get(db_yaml)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        totals = {entry: len(items) for entry, items in read_yaml_ro(db_yaml).items()}
+        _entry_totals[db_yaml] = (stamp, totals)
+        return totals
+
+
+def get_available_items(entry: str, db_yaml: Path, *, encoding: str = "utf-8") -> list[dict]:
+    """Returns the items of the specified entry that have not been sent yet.
+
+    The available items of every entry are kept in memory, so choosing one does not read the
+    register nor filter the whole entry again. They are computed the first time they are needed,
+    and again whenever the YAML file of the entry changes or every item has been sent, while
+    `set_as_used_batch` keeps them up to date as items are marked as used. Once none of the items
+    in the YAML file is available, the used IDs of the entry are cleared from the register, so
+    every item can be sent again. Used IDs of items no longer in the YAML file are not counted.
+
+    The returned list is shared, so callers must hold `register_lock` while using it and must not
+    modify it.
+
+    Args:
+        entry (str): The key of the entry in the YAML file and in the register.
+        db_yaml (Path): The path to the YAML file containing the database entries.
+        encoding (str, optional): The character encoding to use when reading the YAML file.
+            Defaults to "utf-8".
+
+    Returns:
+        list[dict]: The items of the entry that are not in the register.
+
+    Raises:
+        FileNotFoundError: If the specified YAML file cannot be found.
+        yaml.YAMLError: If there is an error parsing the YAML file.
+        sqlite3.Error: If there is an error querying or updating the register database.
+    """
+    mtime = db_yaml.stat().st_mtime_ns
+    with register_lock:
+        cached = available_items.get(entry)
+        if cached is not None and cached[0] == mtime and cached[1]:
+            return cached[1]
+
+        log.info("Computing the available items for entry '%s'...", entry)
+        data = read_yaml_ro(db_yaml, encoding=encoding)[entry]
+        used = get_used_uids(entry)
+        available = [item for item in data if item["uid"] not in used]
+        if not available and data:
+            log.info("All entries for '%s' have been used. Clearing the register.", entry)
+            db = get_register_db()
+            with db:
+                db.execute("DELETE FROM used WHERE entry = ?", (entry,))
+
+            get_used_counts()[entry] = 0
+            available = list(data)
+
+        available_items[entry] = (mtime, available)
+        log.info("Entry '%s' has %d available items.", entry, len(available))
+        return available
+
+
+def choose_available_item(entry: str, db_yaml: Path, *, encoding: str = "utf-8") -> dict | None:
+    """Chooses a random item of the specified entry that has not been sent yet.
+
+    Args:
+        entry (str): The key of the entry in the YAML file and in the register.
+        db_yaml (Path): The path to the YAML file containing the database entries.
+        encoding (str, optional): The character encoding to use when reading the YAML file.
+            Defaults to "utf-8".
+
+    Returns:
+        dict | None: A copy of the chosen item, or None if the entry has no items.
+
+    Raises:
+        FileNotFoundError: If the specified YAML file cannot be found.
+        yaml.YAMLError: If there is an error parsing the YAML file.
+        sqlite3.Error: If there is an error querying the register database.
+    """
+    with register_lock:
+        available = get_available_items(entry, db_yaml, encoding=encoding)
+        if not available:
+            return None
+
+        return dict(available[random.randrange(len(available))])
 
-def text_to_timedelta(text: str) -> timedelta:
-    """Converts a text representation of time into a timedelta object.
 
-    This function takes a string formatted as "HH:MM:SS" and converts it into a timedelta object,
-    allowing for easy manipulation of time intervals in Python.
+def discard_available_item(entry: str, uid: int):
+    """Removes an item from the available items of the specified entry, if they are computed.
+
+    The item is swapped with the last available item before being removed, so the order of the
+    available items is not kept. Callers must hold `register_lock`.
+
+    Args:
+        entry (str): The key of the entry in the register.
+        uid (int): The unique ID of the item to be removed.
+    """
+    cached = available_items.get(entry)
+    if cached is None:
+        return
+
+    available = cached[1]
+    for i, item in enumerate(available):
+        if item["uid"] == uid:
+            available[i] = available[-1]
+            available.pop()
+            return
+
+
+@functools.lru_cache(maxsize=64)
+def text_to_seconds(text: str) -> int:
+    """Converts a text representation of time into a number of seconds.
+
+    This function takes a string formatted as "HH:MM:SS" and converts it into the number of seconds
+    since midnight, so the scheduling computations are plain integer operations. The configured
+    times are always the same few strings, so the conversions are cached.
 
     Args:
         text (str): The text representation of time to be parsed.
 
     Returns:
-        timedelta: A timedelta object representing the parsed time.
+        int: The number of seconds represented by the parsed time.
 
     Raises:
         ValueError: If the input string is not in the expected format or cannot be converted to
             integers.
     """
-    logging.debug("Running method `text_to_timedelta`...")
     try:
         _time: list[int] = [int(x) for x in text.split(":")]
         if len(_time) != 3:
-            logging.error("Input must be in the format 'HH:MM:SS'. Input: %s", text)
+            log.error("Input must be in the format 'HH:MM:SS'. Input: %s", text)
             raise ValueError("Input must be in the format 'HH:MM:SS'")
 
-        result = timedelta(hours=_time[0], minutes=_time[1], seconds=_time[2])
-        logging.info("Conversion successful: %s", result)
+        result = _time[0] * 3600 + _time[1] * 60 + _time[2]
+        log.debug("Conversion successful: %d", result)
         return result
 
     except ValueError as e:
-        logging.error("Error converting text to timedelta: %s", e)
+        log.error("Error converting text to seconds: %s", e)
         raise e
 
-    logging.debug("Method `text_to_timedelta` finished.")
 
+def load_user_configs() -> dict[str, UserConfig]:
+    """Loads the configuration of every user from the Telegram configuration file.
+
+    This function parses the Telegram configuration file, converts the configured times into
+    seconds since midnight and keeps the result in `user_configs`, so it is done only once instead
+    of on every scheduled event. It can be called again to reload the configuration.
+
+    Returns:
+        dict[str, UserConfig]: The configuration of every user, by user identifier.
+
+    Raises:
+        FileNotFoundError: If the configuration file cannot be found.
+        yaml.YAMLError: If there is an error parsing the YAML configuration.
+        ValueError: If any of the configured times is not in the format "HH:MM:SS".
+    """
+    global user_configs
+
+    def to_seconds(text: str | None) -> int | None:
+        return None if text is None else text_to_seconds(text)
+
+    configs: dict[str, UserConfig] = {}
+    for user_id, user in read_yaml_ro(TELEGRAM_CONFIG_PATH).items():
+        morning_greeting = user.get("morning_greeting", {})
+        afternoon_media = user.get("afternoon_media", {})
+        configs[user_id] = UserConfig(
+            chat_id=user.get("chat_id"),
+            morning_start=to_seconds(morning_greeting.get("start_time")),
+            morning_end=to_seconds(morning_greeting.get("end_time")),
+            afternoon_start=to_seconds(afternoon_media.get("start_time")),
+            afternoon_end=to_seconds(afternoon_media.get("end_time")),
+            pills_reminder_time=to_seconds(user.get("pills_reminder", {}).get("time")),
+        )
+
+    user_configs = configs
+    log.info("Loaded the configuration of %d users.", len(configs))
+    return configs
 
-def get_next_time(tm: timedelta, timespan: timedelta, try_now: bool = False) -> datetime:
+
+def get_user_config(user_id: str) -> UserConfig:
+    """Returns the configuration of a user, loading the configuration file the first time.
+
+    Args:
+        user_id (str): The identifier of the user in the Telegram configuration file.
+
+    Returns:
+        UserConfig: The configuration of the user, or an empty one if the user is not configured.
+
+    Raises:
+        FileNotFoundError: If the configuration file cannot be found.
+        yaml.YAMLError: If there is an error parsing the YAML configuration.
+        ValueError: If any of the configured times is not in the format "HH:MM:SS".
+    """
+    configs = user_configs if user_configs is not None else load_user_configs()
+    return configs.get(user_id) or UserConfig()
+
+
+async def get_peer(client: TelegramClient, user_id: str) -> TypeInputPeer | None:
+    """Returns the peer used to send messages to a user.
+
+    This asynchronous function resolves the chat ID of the user into an input peer the first time
+    it is called for the user and keeps it in the user configuration, so Telethon does not need to
+    resolve the chat ID on every message.
+
+    Args:
+        client (TelegramClient): The Telegram client used to resolve the chat ID.
+        user_id (str): The identifier of the user in the Telegram configuration file.
+
+    Returns:
+        TypeInputPeer | None: The input peer of the user, or None if the user has no chat ID
+            configured.
+
+    Raises:
+        FileNotFoundError: If the configuration file cannot be found.
+        yaml.YAMLError: If there is an error parsing the YAML configuration.
+        ValueError: If the chat ID cannot be resolved.
+    """
+    user = get_user_config(user_id)
+    if user.peer is None and user.chat_id is not None:
+        user = replace(user, peer=await client.get_input_entity(user.chat_id))
+        if user_configs is not None and user_id in user_configs:
+            user_configs[user_id] = user
+
+        log.debug("Resolved the peer of user %s: %s", user_id, user.peer)
+
+    return user.peer
+
+
+async def prime_peers(client: TelegramClient):
+    """Resolves the peers of every configured user.
+
+    This asynchronous function is meant to be called once the client is connected, so the peers
+    are already resolved when the scheduled jobs send their messages. A peer that cannot be
+    resolved is logged and resolved again when it is first needed.
+
+    Args:
+        client (TelegramClient): The Telegram client used to resolve the chat IDs.
+    """
+    configs = user_configs if user_configs is not None else load_user_configs()
+    for user_id in list(configs):
+        try:
+            await get_peer(client, user_id)
+
+        except Exception as e:
+            log.warning("Could not resolve the peer of user %s: %s", user_id, e)
+
+
+def get_next_time(tm: int, timespan: timedelta, try_now: bool = False) -> datetime:
     """Calculates the next occurrence of a specified time based on the current time.
 
     This function determines the next datetime by adding a specified time duration to the current
@@ -190,7 +702,7 @@ def get_next_time(tm: timedelta, timespan: timedelta, try_now: bool = False) ->
     current time as a starting point for the calculation.
 
     Args:
-        tm (timedelta): The time of day to calculate the next occurrence for.
+        tm (int): The time of day to calculate the next occurrence for, in seconds since midnight.
         timespan (timedelta): The interval to add if the calculated time is in the past.
         try_now (bool, optional): If True, the current time is used as the starting point;
             otherwise, the timespan is added to the current time. Defaults to False.
@@ -198,353 +710,372 @@ def get_next_time(tm: timedelta, timespan: timedelta, try_now: bool = False) ->
     Returns:
         datetime: The next occurrence of the specified time as a datetime object.
     """
-    logging.debug("Running method `get_next_time`...")
-    logging.info(
-        "Calculating next time with tm: %s, timespan: %s, try_now: %s", tm, timespan, try_now
-    )
+    log.debug("Calculating next time with tm: %s, timespan: %s, try_now: %s", tm, timespan, try_now)
     now = datetime.now()
-    if not try_now:
-        now += timespan
-
-    dt = datetime(
-        year=now.year,
-        month=now.month,
-        day=now.day,
-        hour=tm.seconds // 3600,
-        minute=(tm.seconds % 3600) // 60,
-        second=tm.seconds % 60,
-    )
+    base_date = (now if try_now else now + timespan).date()
+    minutes, second = divmod(tm, 60)
+    hour, minute = divmod(minutes, 60)
+    dt = datetime.combine(base_date, time(hour % 24, minute, second))
 
-    logging.debug("Calculated datetime before adjustment: %s", dt)
+    log.debug("Calculated datetime before adjustment: %s", dt)
 
-    if dt < datetime.now():
-        logging.debug("Calculated time is in the past. Adding timespan: %s", timespan)
+    if dt < now:
+        log.debug("Calculated time is in the past. Adding timespan: %s", timespan)
         dt += timespan
 
-    logging.info("Next occurrence of time is: %s", dt)
-    logging.debug("Method `get_next_time` finished.")
+    log.info("Next occurrence of time is: %s", dt)
     return dt
 
 
-def health() -> str:
-    """Returns the health status of the application.
+async def sleep_until(dt: datetime):
+    """Sleeps until the specified datetime is reached.
 
-    This function provides a simple check to indicate that the application is running and
-    operational. It returns a string message confirming the application's status.
+    This asynchronous function suspends the caller until `dt` without waking the event loop in the
+    meantime. If the sleep ends slightly before `dt`, it keeps sleeping, so a job never runs early.
 
-    Returns:
-        str: A message indicating that the application is alive.
+    Args:
+        dt (datetime): The datetime to sleep until.
     """
-    logging.debug("Running method `health`...")
-    status = "Alive"
-    logging.info("Application health status: %s", status)
-    logging.debug("Method `health` finished.")
-    return status
+    while (delay := (dt - datetime.now()).total_seconds()) > 0:
+        await asyncio.sleep(delay)
 
 
-def get_morning_greeting() -> str:
-    """Retrieves a morning greeting message.
+def create_job(coro: Coroutine) -> asyncio.Task:
+    """Runs a coroutine as a job in a new asyncio task.
 
-    This function acts as a wrapper to obtain a good morning greeting from the `morning` module. It
-    provides a simple interface to access the greeting functionality.
+    The task is tracked in `scheduled_jobs` until it finishes, so it can be cancelled on shutdown.
+
+    Args:
+        coro (Coroutine): The coroutine to be run.
 
     Returns:
-        str: A morning greeting message.
+        asyncio.Task: The task running the coroutine.
     """
-    logging.debug("Running method `get_morning_greeting`...")
-    logging.info("Retrieving morning greeting message...")
-    greeting = morning.get_morning_greeting()
-    logging.info("Morning greeting retrieved: %s", greeting)
-    logging.debug("Method `get_morning_greeting` finished.")
-    return greeting
+    task = asyncio.create_task(coro)
+    scheduled_jobs.add(task)
+    task.add_done_callback(scheduled_jobs.discard)
+    return task
 
 
-def get_morning_sticker() -> dict:
-    """Retrieves a random morning sticker that has not been sent yet.
+async def run_concurrently(*coros: Coroutine) -> list:
+    """Runs several coroutines concurrently and returns their results.
 
-    This function reads the list of morning stickers from a YAML file and filters out those that
-    have already been sent. It then randomly selects one of the remaining stickers and prepares it
-    for use by encoding its file reference.
+    If any of the coroutines raises, the others are cancelled and the error is propagated as is.
+    The coroutines run in an `asyncio.TaskGroup` when it is available (Python 3.11+), which avoids
+    the future `asyncio.gather` builds to collect the results, and in `asyncio.gather` otherwise.
 
-    Returns:
-        dict: A dictionary representing the selected morning sticker, including its file reference
-            and other associated data.
+    Args:
+        *coros (Coroutine): The coroutines to be run.
 
-    Raises:
-        FileNotFoundError: If the specified YAML files cannot be found.
-        yaml.YAMLError: If there is an error parsing the YAML files.
-        ValueError: If there are no available morning stickers to choose from.
+    Returns:
+        list: The results of the coroutines, in the same order.
     """
-    logging.debug("Running method `get_morning_sticker`...")
-    try:
-        logging.info("Retrieving morning stickers...")
-        morning_stickers_sent: list = read_yaml(REGISTER_YAML_PATH).get("morning_stickers", [])
-        logging.debug("Sent morning stickers: %s", morning_stickers_sent)
+    if sys.version_info >= (3, 11):
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(coro) for coro in coros]
 
-        morning_stickers: list = filter_by_register(
-            data=read_yaml(STICKERS_YAML_PATH, encoding="latin-1")["morning_stickers"],
-            register=morning_stickers_sent,
-        )
-        logging.debug("Available morning stickers after filtering: %d", len(morning_stickers))
+        except BaseExceptionGroup as eg:
+            raise eg.exceptions[0] from eg
 
-        if not morning_stickers:
-            logging.error("No available morning stickers to choose from.")
-            raise ValueError("No available morning stickers to choose from.")
+        return [task.result() for task in tasks]
 
-        morning_sticker: dict = random.choice(morning_stickers)
-        morning_sticker["file_reference"] = morning_sticker["file_reference"].encode("latin-1")
-        logging.info("Selected morning sticker: %s", morning_sticker)
-        logging.debug("Method `get_morning_sticker` finished.")
-        return morning_sticker
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
 
-    except FileNotFoundError as e:
-        logging.error("YAML file not found: %s", e)
-        raise e
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
 
-    except yaml.YAMLError as e:
-        logging.error("Error parsing YAML file: %s", e)
-        raise e
 
+def schedule_daily_job(tm: int, job: Callable[..., Awaitable], *args) -> asyncio.Task:
+    """Schedules a job to be run every day at the specified time.
 
-def get_morning_media() -> dict:
-    """Retrieves a random morning media item that has not been sent yet.
+    This function creates an asyncio task that, in a loop, sleeps until the next occurrence of `tm`
+    and then awaits the job with the given arguments. An error in one run is logged and does not
+    prevent the job from running the next day.
 
-    This function reads the list of morning media items from a YAML file and filters out those that
-    have already been sent. It then randomly selects one of the remaining media items for use.
+    Args:
+        tm (int): The time of day at which the job must be run, in seconds since midnight.
+        job (Callable[..., Awaitable]): The coroutine function to be run.
+        *args: The arguments passed to the job.
 
     Returns:
-        dict: A dictionary representing the selected morning media item, including its associated
-            data.
-
-    Raises:
-        FileNotFoundError: If the specified YAML files cannot be found.
-        yaml.YAMLError: If there is an error parsing the YAML files.
-        ValueError: If there are no available morning media items to choose from.
+        asyncio.Task: The task running the job.
     """
-    logging.debug("Running method `get_morning_media`...")
-    try:
-        logging.info("Retrieving morning media items...")
-        morning_media_sent = read_yaml(REGISTER_YAML_PATH).get("morning_media", [])
-        logging.debug("Sent morning media items: %s", morning_media_sent)
 
-        morning_media = filter_by_register(
-            data=read_yaml(MEDIA_YAML_PATH)["morning_media"],
-            register=morning_media_sent,
-        )
-        logging.debug("Available morning media items after filtering: %d", len(morning_media))
+    async def run():
+        """Runs the job every day at the scheduled time, logging any error it raises."""
+        while True:
+            dt = get_next_time(tm, ONE_DAY, try_now=True)
+            await sleep_until(dt)
+            try:
+                await job(*args)
 
-        if not morning_media:
-            logging.error("No available morning media items to choose from.")
-            raise ValueError("No available morning media items to choose from.")
+            except Exception as e:
+                log.error("Error running the daily job scheduled at %s: %s", dt, e)
 
-        selected_media = random.choice(morning_media)
-        logging.info("Selected morning media item: %s", selected_media)
-        logging.debug("Method `get_morning_media` finished.")
-        return selected_media
+    return create_job(run())
 
-    except FileNotFoundError as e:
-        logging.error("YAML file not found: %s", e)
-        raise e
 
-    except yaml.YAMLError as e:
-        logging.error("Error parsing YAML file: %s", e)
-        raise e
+def cancel_scheduled_jobs():
+    """Cancels every job that is still scheduled.
 
+    This function is meant to be called on shutdown, so no job is left pending when the event loop
+    stops.
+    """
+    log.info("Cancelling %d scheduled jobs.", len(scheduled_jobs))
+    for task in list(scheduled_jobs):
+        task.cancel()
 
-def get_afternoon_media() -> dict:
-    """Retrieves a random afternoon media item that has not been sent yet.
 
-    This function reads the list of afternoon media items from a YAML file and filters out those
-    that have already been sent. It then randomly selects one of the remaining media items for use.
+def log_errors(fn: Callable) -> Callable:
+    """Logs any error raised by a function before propagating it.
 
-    Returns:
-        dict: A dictionary representing the selected afternoon media item, including its associated
-            data.
+    This decorator wraps a function, or a coroutine function, so that any error it raises is logged
+    along with the function name, telling apart missing files and YAML parsing errors, and then
+    re-raised with its original traceback.
 
-    Raises:
-        FileNotFoundError: If the specified YAML files cannot be found.
-        yaml.YAMLError: If there is an error parsing the YAML files.
-        ValueError: If there are no available afternoon media items to choose from.
+    Args:
+        fn (Callable): The function to be wrapped.
+
+    Returns:
+        Callable: The wrapped function.
     """
-    logging.debug("Running method `get_afternoon_media`...")
-    try:
-        logging.info("Retrieving afternoon media items...")
-        afternoon_media_sent = read_yaml(REGISTER_YAML_PATH).get("afternoon_media", [])
-        logging.debug("Sent afternoon media items: %s", afternoon_media_sent)
 
-        afternoon_media = filter_by_register(
-            data=read_yaml(MEDIA_YAML_PATH)["afternoon_media"],
-            register=afternoon_media_sent,
-        )
-        logging.debug("Available afternoon media items after filtering: %d", len(afternoon_media))
+    def log_error(e: Exception):
+        if isinstance(e, FileNotFoundError):
+            log.error("File not found in `%s`: %s", fn.__name__, e)
+        elif isinstance(e, yaml.YAMLError):
+            log.error("Error parsing YAML file in `%s`: %s", fn.__name__, e)
+        else:
+            log.error("Error in `%s`: %s", fn.__name__, e)
 
-        if not afternoon_media:
-            logging.error("No available afternoon media items to choose from.")
-            raise ValueError("No available afternoon media items to choose from.")
+    if asyncio.iscoroutinefunction(fn):
 
-        selected_media = random.choice(afternoon_media)
-        logging.info("Selected afternoon media item: %s", selected_media)
-        logging.debug("Method `get_afternoon_media` finished.")
-        return selected_media
+        @functools.wraps(fn)
+        async def async_wrap(*args, **kwargs):
+            try:
+                return await fn(*args, **kwargs)
 
-    except FileNotFoundError as e:
-        logging.error("YAML file not found: %s", e)
-        raise e
+            except Exception as e:
+                log_error(e)
+                raise
 
-    except yaml.YAMLError as e:
-        logging.error("Error parsing YAML file: %s", e)
-        raise e
+        return async_wrap
 
+    @functools.wraps(fn)
+    def wrap(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
 
-def set_as_used(entry: str, uid: int, db_yaml: Path):
-    """Marks a specified entry as used by adding a unique ID to the register.
+        except Exception as e:
+            log_error(e)
+            raise
 
-    This function updates the register by adding the provided unique ID to the list of used IDs for
-    the specified entry. If the number of used IDs matches the total entries in the database, it
-    clears the list for that entry.
+    return wrap
 
-    Args:
-        entry (str): The key in the register that corresponds to the entry being updated.
-        uid (int): The unique ID to be marked as used.
-        db_yaml (Path): The path to the YAML file containing the database entries.
 
-    Raises:
-        FileNotFoundError: If the specified YAML files cannot be found.
-        yaml.YAMLError: If there is an error parsing the YAML files.
+def health() -> str:
+    """Returns the health status of the application.
+
+    This function provides a simple check to indicate that the application is running and
+    operational. It returns a string message confirming the application's status.
+
+    Returns:
+        str: A message indicating that the application is alive.
     """
-    logging.debug("Running method `set_as_used`...")
-    try:
-        logging.info("Marking entry '%s' as used for UID: %d", entry, uid)
-        register = read_yaml(REGISTER_YAML_PATH)
-        logging.debug("Current register before update: %s", register)
+    status = "Alive"
+    log.info("Application health status: %s", status)
+    return status
 
-        if uid not in register[entry]:
-            bisect.insort(register[entry], uid)
-            logging.info("UID %d added to register for entry '%s'.", uid, entry)
 
-            data = read_yaml(db_yaml)
-            if len(register[entry]) == len(data[entry]):
-                register[entry] = []
-                logging.info("All entries for '%s' have been used. Clearing the register.", entry)
+def get_morning_greeting() -> str:
+    """Retrieves a morning greeting message.
 
-            save_yaml(register, REGISTER_YAML_PATH)
-            logging.info("Register updated and saved successfully.")
+    This function acts as a wrapper to obtain a good morning greeting from the `morning` module. It
+    provides a simple interface to access the greeting functionality.
 
-        else:
-            logging.info("UID %d is already marked as used for entry '%s'.", uid, entry)
+    Returns:
+        str: A morning greeting message.
+    """
+    log.info("Retrieving morning greeting message...")
+    greeting = morning.get_morning_greeting()
+    log.info("Morning greeting retrieved: %s", greeting)
+    return greeting
 
-    except FileNotFoundError as e:
-        logging.error("YAML file not found: %s", e)
-        raise e
 
-    except yaml.YAMLError as e:
-        logging.error("Error parsing YAML file: %s", e)
-        raise e
+def get_sticker_document(sticker: dict) -> InputDocument:
+    """Returns the document used to send a sticker.
+
+    This function builds the `InputDocument` of the sticker, encoding its file reference, and
+    caches it by UID, so it is built only once while the file reference of the sticker does not
+    change.
+
+    Args:
+        sticker (dict): The sticker, as defined in the stickers file.
 
-    logging.debug("Method `set_as_used` finished.")
+    Returns:
+        InputDocument: The document used to send the sticker.
+    """
+    cached = sticker_documents.get(sticker["uid"])
+    if cached is not None and cached[0] == sticker["file_reference"]:
+        return cached[1]
+
+    document = InputDocument(
+        id=sticker["id"],
+        access_hash=sticker["access_hash"],
+        file_reference=sticker["file_reference"].encode("latin-1"),
+    )
+    sticker_documents[sticker["uid"]] = (sticker["file_reference"], document)
+    return document
 
 
-def set_morning_sticker_as_used(uid: int):
-    """Marks a morning sticker as used for a specified unique ID.
+@log_errors
+def get_morning_sticker() -> dict:
+    """Retrieves a random morning sticker that has not been sent yet.
 
-    This function updates the register to indicate that the morning sticker has been used by the
-    provided unique ID. It calls the `set_as_used` function with the appropriate parameters to
-    perform the update.
+    This function randomly selects one of the morning stickers that have not been sent yet, kept in
+    memory by `get_available_items`, and prepares it for use by attaching its document, under the
+    "document" key, and its encoded file reference.
 
-    Args:
-        uid (int): The unique ID to be marked as having used the morning sticker.
+    Returns:
+        dict: A dictionary representing the selected morning sticker, including its document, its
+            file reference and other associated data.
 
     Raises:
         FileNotFoundError: If the specified YAML files cannot be found.
         yaml.YAMLError: If there is an error parsing the YAML files.
+        sqlite3.Error: If there is an error querying the register database.
+        ValueError: If there are no available morning stickers to choose from.
     """
-    logging.debug("Running method `set_morning_sticker_as_used`...")
-    try:
-        logging.info("Marking morning sticker as used for UID: %d", uid)
-        set_as_used("morning_stickers", uid, STICKERS_YAML_PATH)
-        logging.info("Morning sticker marked as used for UID: %d", uid)
-
-    except FileNotFoundError as e:
-        logging.error("YAML file not found: %s", e)
-        raise e
-
-    except yaml.YAMLError as e:
-        logging.error("Error parsing YAML file: %s", e)
-        raise e
+    log.info("Retrieving morning stickers...")
+    morning_sticker = choose_available_item(
+        "morning_stickers", STICKERS_YAML_PATH, encoding="latin-1"
+    )
+    if morning_sticker is None:
+        log.error("No available morning stickers to choose from.")
+        raise ValueError("No available morning stickers to choose from.")
 
-    logging.debug("Method `set_morning_sticker_as_used` finished.")
+    document = get_sticker_document(morning_sticker)
+    morning_sticker["document"] = document
+    morning_sticker["file_reference"] = document.file_reference
+    log.info("Selected morning sticker with UID: %s", morning_sticker["uid"])
+    return morning_sticker
 
 
-def set_morning_media_as_used(uid: int):
-    """Marks a morning media item as used for a specified unique ID.
+@log_errors
+def get_morning_media() -> dict:
+    """Retrieves a random morning media item that has not been sent yet.
 
-    This function updates the register to indicate that the morning media item has been used by the
-    provided unique ID. It calls the `set_as_used` function with the appropriate parameters to
-    perform the update.
+    This function randomly selects one of the morning media items that have not been sent yet, kept
+    in memory by `get_available_items`.
 
-    Args:
-        uid (int): The unique ID to be marked as having used the morning media item.
+    Returns:
+        dict: A dictionary representing the selected morning media item, including its associated
+            data.
 
     Raises:
         FileNotFoundError: If the specified YAML files cannot be found.
         yaml.YAMLError: If there is an error parsing the YAML files.
+        sqlite3.Error: If there is an error querying the register database.
+        ValueError: If there are no available morning media items to choose from.
     """
-    logging.debug("Running method `set_morning_media_as_used`...")
-    try:
-        logging.info("Marking morning media as used for UID: %d", uid)
-        set_as_used("morning_media", uid, MEDIA_YAML_PATH)
-        logging.info("Morning media marked as used for UID: %d", uid)
+    log.info("Retrieving morning media items...")
+    selected_media = choose_available_item("morning_media", MEDIA_YAML_PATH)
+    if selected_media is None:
+        log.error("No available morning media items to choose from.")
+        raise ValueError("No available morning media items to choose from.")
 
-    except FileNotFoundError as e:
-        logging.error("YAML file not found: %s", e)
-        raise e
-
-    except yaml.YAMLError as e:
-        logging.error("Error parsing YAML file: %s", e)
-        raise e
+    log.info("Selected morning media item: %s", selected_media)
+    return selected_media
 
-    logging.debug("Method `set_morning_media_as_used` finished.")
 
+@log_errors
+def get_afternoon_media() -> dict:
+    """Retrieves a random afternoon media item that has not been sent yet.
 
-def set_afternoon_media_as_used(uid: int):
-    """Marks an afternoon media item as used for a specified unique ID.
-
-    This function updates the register to indicate that the afternoon media item has been used by
-    the provided unique ID. It calls the `set_as_used` function with the appropriate parameters to
-    perform the update.
+    This function randomly selects one of the afternoon media items that have not been sent yet,
+    kept in memory by `get_available_items`.
 
-    Args:
-        uid (int): The unique ID to be marked as having used the afternoon media item.
+    Returns:
+        dict: A dictionary representing the selected afternoon media item, including its associated
+            data.
 
     Raises:
         FileNotFoundError: If the specified YAML files cannot be found.
         yaml.YAMLError: If there is an error parsing the YAML files.
+        sqlite3.Error: If there is an error querying the register database.
+        ValueError: If there are no available afternoon media items to choose from.
     """
-    logging.debug("Running method `set_afternoon_media_as_used`...")
-    try:
-        logging.info("Marking afternoon media as used for UID: %d", uid)
-        set_as_used("afternoon_media", uid, MEDIA_YAML_PATH)
-        logging.info("Afternoon media marked as used for UID: %d", uid)
+    log.info("Retrieving afternoon media items...")
+    selected_media = choose_available_item("afternoon_media", MEDIA_YAML_PATH)
+    if selected_media is None:
+        log.error("No available afternoon media items to choose from.")
+        raise ValueError("No available afternoon media items to choose from.")
 
-    except FileNotFoundError as e:
-        logging.error("YAML file not found: %s", e)
-        raise e
+    log.info("Selected afternoon media item: %s", selected_media)
+    return selected_media
 
-    except yaml.YAMLError as e:
-        logging.error("Error parsing YAML file: %s", e)
-        raise e
 
-    logging.debug("Method `set_afternoon_media_as_used` finished.")
+@log_errors
+def set_as_used_batch(updates: list[tuple[str, int]]):
+    """Marks several entries as used by adding their unique IDs to the register.
+
+    This function applies every update in a single transaction of the register database, so marking
+    the sticker and the media of a greeting as used commits only once. Each update adds the unique
+    ID to the used IDs of its entry, and removes the item from the available items of the entry.
+    The register of an entry is cleared by `get_available_items` once none of its items is
+    available, so neither the register nor the YAML file is read here.
 
+    Args:
+        updates (list[tuple[str, int]]): The updates to be applied, as tuples of the key in the
+            register and the unique ID to be marked as used.
 
+    Raises:
+        sqlite3.Error: If there is an error updating the register database.
+    """
+    db = get_register_db()
+    counts: dict[str, int] = {}
+    discarded: list[tuple[str, int]] = []
+    with register_lock:
+        used_before = get_used_counts()
+        with db:
+            for entry, uid in updates:
+                log.info("Marking entry '%s' as used for UID: %d", entry, uid)
+                inserted = db.execute(
+                    "INSERT OR IGNORE INTO used VALUES (?, ?)", (entry, uid)
+                ).rowcount
+                if not inserted:
+                    log.info("UID %d is already marked as used for entry '%s'.", uid, entry)
+                    continue
+
+                log.info("UID %d added to register for entry '%s'.", uid, entry)
+                discarded.append((entry, uid))
+                counts[entry] = counts.get(entry, used_before.get(entry, 0)) + 1
+
+        # The counts and the available items are only updated once the transaction is committed,
+        # so they are left untouched if any update fails and the transaction is rolled back
+        used_before.update(counts)
+        for entry, uid in discarded:
+            discard_available_item(entry, uid)
+
+    log.info("Register updated and saved successfully.")
+
+
+@log_errors
 async def send_morning_greeting(
     client: TelegramClient, user_id: str = "nathy", set_as_used: bool = True
 ):
     """Sends a morning greeting message along with a sticker and media to a user.
 
     This asynchronous function retrieves a morning greeting message, a sticker, and media, then
-    sends them to the specified user via a Telegram client. It can also mark the sticker and media
-    as used if specified.
+    sends them to the specified user via a Telegram client. The message is sent first, and then the
+    sticker and the media are sent concurrently. It can also mark the sticker and media as used if
+    specified. Choosing the sticker and the media and updating the register run in worker threads,
+    so they do not block the event loop, and the sticker and the media are chosen concurrently.
 
     Args:
         client (TelegramClient): The Telegram client used to send messages.
@@ -558,140 +1089,119 @@ async def send_morning_greeting(
         yaml.YAMLError: If there is an error parsing the YAML configuration.
         Exception: If there is an error sending messages through the Telegram client.
     """
-    logging.debug("Running method `send_morning_greeting`...")
-    try:
-        logging.info("Preparing to send morning greeting to user: %s", user_id)
-        tconfig = read_yaml(TELEGRAM_CONFIG_PATH)
-        user_id = tconfig.get(user_id, {}).get("chat_id")
-        logging.debug("Resolved user ID: %s", user_id)
+    log.debug("Running method `send_morning_greeting`...")
+    log.info("Preparing to send morning greeting to user: %s", user_id)
+    # The peer, the sticker and the media are retrieved concurrently, the last two in threads
+    peer, sticker, media = await run_concurrently(
+        get_peer(client, user_id),
+        asyncio.to_thread(get_morning_sticker),
+        asyncio.to_thread(get_morning_media),
+    )
+    log.debug("Resolved peer: %s", peer)
+    log.debug("Retrieved morning sticker with UID: %s", sticker["uid"])
+    log.debug("Retrieved morning media: %s", media)
 
-        msg = get_morning_greeting()
-        logging.debug("Retrieved morning greeting message: %s", msg)
+    msg = get_morning_greeting()
+    log.debug("Retrieved morning greeting message: %s", msg)
 
-        sticker = get_morning_sticker()
-        logging.debug("Retrieved morning sticker: %s", sticker)
+    await client.send_message(peer, msg)
+    log.debug("Sent morning greeting message to user: %s", user_id)
 
-        media = get_morning_media()
-        logging.debug("Retrieved morning media: %s", media)
+    # The sticker and the media are sent concurrently, once the greeting message is already sent
+    await run_concurrently(
+        client.send_message(peer, file=sticker["document"]),
+        client.send_file(peer, MEDIA_PATH / media["path"]),
+    )
 
-        await client.send_message(user_id, msg)
-        logging.debug("Sent morning greeting message to user: %s", user_id)
+    log.debug("Sent morning sticker and media to user: %s", user_id)
+    log.info("Morning greeting sent to user")
 
-        await client.send_message(
-            user_id,
-            file=InputDocument(
-                id=sticker["id"],
-                access_hash=sticker["access_hash"],
-                file_reference=sticker["file_reference"],
-            ),
+    if set_as_used:
+        await asyncio.to_thread(
+            set_as_used_batch,
+            [
+                ("morning_stickers", sticker["uid"]),
+                ("morning_media", media["uid"]),
+            ],
         )
-        logging.debug("Sent morning sticker to user: %s", user_id)
-
-        await client.send_file(user_id, MEDIA_PATH / media["path"])
-        logging.debug("Sent morning media to user: %s", user_id)
-        logging.info("Morning greeting sent to user")
-
-        if set_as_used:
-            set_morning_sticker_as_used(sticker["uid"])
-            set_morning_media_as_used(media["uid"])
-            logging.debug("Marked sticker and media as used.")
-
-    except FileNotFoundError as e:
-        logging.error("Configuration or media file not found: %s", e)
-        raise e
-
-    except yaml.YAMLError as e:
-        logging.error("Error parsing YAML configuration: %s", e)
-        raise e
-
-    except Exception as e:
-        logging.error("Error sending messages through Telegram client: %s", e)
-        raise e
+        log.debug("Marked sticker and media as used.")
 
-    logging.debug("Method `send_morning_greeting` finished.")
+    log.debug("Method `send_morning_greeting` finished.")
 
 
+@log_errors
 def start_sending_morning_greeting(
-    scheduler: AsyncIOScheduler,
     client: TelegramClient,
     user_id: str = "nathy",
     try_today: bool = False,
-):
+) -> asyncio.Task:
     """Schedules the sending of morning greeting messages via Telegram.
 
     This function retrieves the configured start and end times for morning greetings, calculates a
-    random time within that range, and schedules the greeting to be sent using the provided
-    scheduler. It can also attempt to send the greeting for today if specified.
+    random time within that range, and schedules the greeting to be sent at that time. It can also
+    attempt to send the greeting for today if specified.
+
+    A single long-lived task sends the greetings: every day it picks a new random time, sleeps until
+    then and sends the greeting. An error while sending is logged and does not stop the greetings
+    of the following days.
 
     Args:
-        scheduler (AsyncIOScheduler): The scheduler instance used to manage scheduled jobs.
         client (TelegramClient): The Telegram client used to send messages.
         user_id (str, optional): The identifier for the user to whom the greeting is sent. Defaults
             to "nathy".
         try_today (bool, optional): If True, sends the greeting today if the calculated time has not
             passed. Defaults to False.
+
+    Returns:
+        asyncio.Task: The task sending the morning greetings.
     """
-    logging.debug("Running method `start_sending_morning_greeting`...")
-    try:
-        logging.info("Starting the scheduling of morning greetings for user: %s", user_id)
-        tconfig = read_yaml(TELEGRAM_CONFIG_PATH)
-        morning_greeting_time = tconfig.get(user_id, {}).get("morning_greeting", {})
-        start_time = text_to_timedelta(morning_greeting_time.get("start_time"))
-        end_time = text_to_timedelta(morning_greeting_time.get("end_time"))
-        logging.info("Morning greeting time range: %s - %s", start_time, end_time)
-
-        tm = random_time(start=start_time, end=end_time)
-        logging.debug("Random time selected for morning greeting: %s", tm)
-
-        dt = get_next_time(tm, timedelta(days=1), try_today)
-        logging.info("Next greeting scheduled for: %s", dt)
-
-        async def wrap(scheduler: AsyncIOScheduler, client: TelegramClient):
-            """Wraps the process of sending a morning greeting and rescheduling it.
-
-            This asynchronous function sends a morning greeting message using the provided Telegram
-            client and then schedules the next morning greeting using the specified scheduler. It
-            ensures that the greeting process is repeated at the appropriate time.
-
-            Args:
-                scheduler (AsyncIOScheduler): The scheduler instance used to manage the scheduling
-                    of jobs.
-                client (TelegramClient): The Telegram client used to send the greeting message.
-            """
-            logging.info("Sending morning greeting...")
-            await send_morning_greeting(client)
-            logging.info("Morning greeting sent. Rescheduling next greeting.")
-            start_sending_morning_greeting(scheduler, client)
-
-        global next_greeting_time
-        next_greeting_time = dt
-        logging.debug("Next greeting time set globally: %s", next_greeting_time)
-
-        scheduler.add_job(wrap, "date", run_date=dt, args=[scheduler, client])
-        logging.debug("Job added to scheduler for morning greeting at: %s", dt)
-
-    except FileNotFoundError as e:
-        logging.error("Configuration file not found: %s", e)
-        raise e
+    log.debug("Running method `start_sending_morning_greeting`...")
+    log.info("Starting the scheduling of morning greetings for user: %s", user_id)
+    user = get_user_config(user_id)
+    start_time, end_time = user.morning_start, user.morning_end
+    if start_time is None or end_time is None:
+        log.error("No morning greeting time configured for user: %s", user_id)
+        raise ValueError(f"No morning greeting time configured for user: {user_id}")
 
-    except yaml.YAMLError as e:
-        logging.error("Error parsing YAML configuration: %s", e)
-        raise e
+    log.info("Morning greeting time range: %d - %d seconds after midnight", start_time, end_time)
 
-    except Exception as e:
-        logging.error("Error scheduling morning greeting: %s", e)
-        raise e
+    async def run():
+        """Sends a morning greeting every day at a random time within the configured range."""
+        today = try_today
+        while True:
+            tm = random_time(start=start_time, end=end_time)
+            log.debug("Random time selected for morning greeting: %d seconds after midnight", tm)
+
+            dt = get_next_time(tm, ONE_DAY, today)
+            today = False
+            schedule_state.set_next_greeting_time(dt)
+            log.info("Next greeting scheduled for: %s", dt)
+
+            await sleep_until(dt)
+            try:
+                log.info("Sending morning greeting...")
+                await send_morning_greeting(client, user_id)
+                log.info("Morning greeting sent.")
 
-    logging.debug("Method `start_sending_morning_greeting` finished.")
+            except Exception as e:
+                log.error("Error sending the morning greeting scheduled at %s: %s", dt, e)
 
+    task = create_job(run())
+    log.debug("Job scheduled for morning greetings.")
 
+    log.debug("Method `start_sending_morning_greeting` finished.")
+    return task
+
+
+@log_errors
 async def send_afternoon_media(
     client: TelegramClient, user_id: str = "nathy", set_as_used: bool = True
 ):
     """Sends an afternoon media item to a specified user.
 
     This asynchronous function retrieves an afternoon media item and sends it to the specified user
-    via a Telegram client. It can also mark the media item as used if specified.
+    via a Telegram client. It can also mark the media item as used if specified. Reading the files
+    and updating the register run in worker threads, so they do not block the event loop.
 
     Args:
         client (TelegramClient): The Telegram client used to send the media.
@@ -705,122 +1215,101 @@ async def send_afternoon_media(
         yaml.YAMLError: If there is an error parsing the YAML configuration.
         Exception: If there is an error sending the media through the Telegram client.
     """
-    logging.debug("Running method `send_afternoon_media`...")
-    try:
-        logging.info("Preparing to send afternoon media to user: %s", user_id)
-        tconfig = read_yaml(TELEGRAM_CONFIG_PATH)
-        user_id = tconfig.get(user_id, {}).get("chat_id")
-        logging.debug("Resolved user ID: %s", user_id)
+    log.debug("Running method `send_afternoon_media`...")
+    log.info("Preparing to send afternoon media to user: %s", user_id)
+    peer = await get_peer(client, user_id)
+    log.debug("Resolved peer: %s", peer)
 
-        media = get_afternoon_media()
-        logging.debug("Retrieved afternoon media item: %s", media)
+    media = await asyncio.to_thread(get_afternoon_media)
+    log.debug("Retrieved afternoon media item: %s", media)
 
-        await client.send_file(user_id, MEDIA_PATH / media["path"])
-        logging.info("Afternoon media sent to user")
+    await client.send_file(peer, MEDIA_PATH / media["path"])
+    log.info("Afternoon media sent to user")
 
-        if set_as_used:
-            set_afternoon_media_as_used(media["uid"])
-            logging.debug("Marked afternoon media as used for UID: %s", media["uid"])
+    if set_as_used:
+        await asyncio.to_thread(set_as_used_batch, [("afternoon_media", media["uid"])])
+        log.debug("Marked afternoon media as used for UID: %s", media["uid"])
 
-    except FileNotFoundError as e:
-        logging.error("Configuration or media file not found: %s", e)
-        raise e
-
-    except yaml.YAMLError as e:
-        logging.error("Error parsing YAML configuration: %s", e)
-        raise e
-
-    except Exception as e:
-        logging.error("Error sending media through Telegram client: %s", e)
-        raise e
-
-    logging.debug("Method `send_afternoon_media` finished.")
+    log.debug("Method `send_afternoon_media` finished.")
 
 
+@log_errors
 def start_sending_afternoon_media(
-    scheduler: AsyncIOScheduler,
     client: TelegramClient,
     user_id: str = "nathy",
     try_today: bool = False,
-):
+) -> asyncio.Task:
     """Schedules the sending of afternoon media messages via Telegram.
 
     This function retrieves the configured start and end times for afternoon media, calculates a
-    random time within that range, and schedules the media to be sent using the provided scheduler.
-    It can also attempt to send the media for today if specified.
+    random time within that range, and schedules the media to be sent at that time. It can also
+    attempt to send the media for today if specified.
+
+    A single long-lived task sends the media: every day it picks a new random time, sleeps until
+    then and sends a media item. An error while sending is logged and does not stop the media of
+    the following days.
 
     Args:
-        scheduler (AsyncIOScheduler): The scheduler instance used to manage scheduled jobs.
         client (TelegramClient): The Telegram client used to send messages.
         user_id (str, optional): The identifier for the user to whom the greeting is sent. Defaults
             to "nathy".
         try_today (bool, optional): If True, sends the media today if the calculated time has not
             passed. Defaults to False.
 
+    Returns:
+        asyncio.Task: The task sending the afternoon media.
+
     Raises:
         FileNotFoundError: If the configuration files cannot be found.
         yaml.YAMLError: If there is an error parsing the YAML configuration.
+        ValueError: If the afternoon media time is not configured for the user.
     """
-    logging.debug("Running method `start_sending_afternoon_media`...")
-    try:
-        logging.info("Starting the scheduling of afternoon media for user: %s", user_id)
-        tconfig = read_yaml(TELEGRAM_CONFIG_PATH)
-        afternoon_media_time = tconfig.get(user_id, {}).get("afternoon_media", {})
-        start_time = text_to_timedelta(afternoon_media_time.get("start_time"))
-        end_time = text_to_timedelta(afternoon_media_time.get("end_time"))
-        logging.debug("Afternoon media time range: %s - %s", start_time, end_time)
-
-        tm = random_time(start=start_time, end=end_time)
-        logging.debug("Random time selected for afternoon media: %s", tm)
-
-        dt = get_next_time(tm, timedelta(days=1), try_today)
-        logging.info("Next afternoon media scheduled for: %s", dt)
-
-        async def wrap(scheduler: AsyncIOScheduler, client: TelegramClient):
-            """Wraps the process of sending afternoon media and rescheduling it.
-
-            This asynchronous function sends an afternoon media item using the provided Telegram client
-            and then schedules the next afternoon media sending using the specified scheduler. It
-            ensures that the media sending process is repeated at the appropriate time.
-
-            Args:
-                scheduler (AsyncIOScheduler): The scheduler instance used to manage the scheduling of
-                    jobs.
-                client (TelegramClient): The Telegram client used to send the media item.
-            """
-            logging.info("Sending afternoon media...")
-            await send_afternoon_media(client)
-            logging.info("Afternoon media sent. Rescheduling next media sending.")
-            start_sending_afternoon_media(scheduler, client)
-
-        global next_afternoon_media_time
-        next_afternoon_media_time = dt
-        logging.debug("Next afternoon media time set globally: %s", next_afternoon_media_time)
-
-        scheduler.add_job(wrap, "date", run_date=dt, args=[scheduler, client])
-        logging.debug("Job added to scheduler for afternoon media at: %s", dt)
-
-    except FileNotFoundError as e:
-        logging.error("Configuration file not found: %s", e)
-        raise e
+    log.debug("Running method `start_sending_afternoon_media`...")
+    log.info("Starting the scheduling of afternoon media for user: %s", user_id)
+    user = get_user_config(user_id)
+    start_time, end_time = user.afternoon_start, user.afternoon_end
+    if start_time is None or end_time is None:
+        log.error("No afternoon media time configured for user: %s", user_id)
+        raise ValueError(f"No afternoon media time configured for user: {user_id}")
 
-    except yaml.YAMLError as e:
-        logging.error("Error parsing YAML configuration: %s", e)
-        raise e
+    log.debug("Afternoon media time range: %d - %d seconds after midnight", start_time, end_time)
 
-    except Exception as e:
-        logging.error("Error scheduling afternoon media: %s", e)
-        raise e
+    async def run():
+        """Sends an afternoon media item every day at a random time in the configured range."""
+        today = try_today
+        while True:
+            tm = random_time(start=start_time, end=end_time)
+            log.debug("Random time selected for afternoon media: %d seconds after midnight", tm)
+
+            dt = get_next_time(tm, ONE_DAY, today)
+            today = False
+            schedule_state.set_next_afternoon_media_time(dt)
+            log.info("Next afternoon media scheduled for: %s", dt)
+
+            await sleep_until(dt)
+            try:
+                log.info("Sending afternoon media...")
+                await send_afternoon_media(client, user_id)
+                log.info("Afternoon media sent.")
+
+            except Exception as e:
+                log.error("Error sending the afternoon media scheduled at %s: %s", dt, e)
 
-    logging.debug("Method `start_sending_afternoon_media` finished.")
+    task = create_job(run())
+    log.debug("Job scheduled for afternoon media.")
 
+    log.debug("Method `start_sending_afternoon_media` finished.")
+    return task
 
+
+@log_errors
 async def send_stats(client: TelegramClient, user_id: str):
     """Sends a message containing the remaining media items to a specified user.
 
-    This asynchronous function retrieves the current state of media items and the register,
-    calculates the remaining items for each media type, and sends a summary message to the
-    specified user via the Telegram client.
+    This asynchronous function retrieves the number of media items and of items in the register,
+    both kept in memory, calculates the remaining items for each media type, and sends a summary
+    message to the specified user via the Telegram client. The counts are loaded concurrently in
+    worker threads, so loading them for the first time does not block the event loop.
 
     Args:
         client (TelegramClient): The Telegram client used to send the message.
@@ -829,134 +1318,127 @@ async def send_stats(client: TelegramClient, user_id: str):
     Raises:
         FileNotFoundError: If the specified YAML files cannot be found.
         yaml.YAMLError: If there is an error parsing the YAML files.
+        sqlite3.Error: If there is an error querying the register database.
         Exception: If there is an error sending the message through the Telegram client.
     """
-    logging.debug("Running method `send_stats`...")
-    try:
-        logging.info("Preparing to send stats to user: %s", user_id)
-        register = read_yaml(REGISTER_YAML_PATH)
-        logging.debug("Loaded register data: %s", register)
+    log.debug("Running method `send_stats`...")
+    log.info("Preparing to send stats to user: %s", user_id)
 
-        media_data = read_yaml(MEDIA_YAML_PATH)
-        logging.debug("Loaded media data: %s", media_data)
+    def copy_used_counts() -> dict[str, int]:
+        with register_lock:
+            return dict(get_used_counts())
 
-        msg = "Remaining:"
-        for data in (media_data,):
-            for field in data:
-                remaining_count = len(data[field]) - len(register[field])
-                msg += f"\n  - {field}: {remaining_count}"
-                logging.debug("Calculated remaining %s: %d", field, remaining_count)
+    # Loading the counts may query the register or parse the media file, so it runs in threads
+    register, media_data = await run_concurrently(
+        asyncio.to_thread(copy_used_counts), asyncio.to_thread(get_entry_totals, MEDIA_YAML_PATH)
+    )
+    log.debug("Loaded register counts: %s", register)
+    log.debug("Loaded media counts: %s", media_data)
 
-        await client.send_message(user_id, msg)
-        logging.info("Sent stats message to user %s: %s", user_id, msg.replace("\n", " | "))
+    lines = ["Remaining:"]
+    for entry, total in media_data.items():
+        remaining_count = total - register.get(entry, 0)
+        lines.append(f"  - {entry}: {remaining_count}")
+        log.debug("Calculated remaining %s: %d", entry, remaining_count)
 
-    except FileNotFoundError as e:
-        logging.error("YAML file not found: %s", e)
-        raise e
+    msg = "\n".join(lines)
 
-    except yaml.YAMLError as e:
-        logging.error("Error parsing YAML file: %s", e)
-        raise e
+    await client.send_message(user_id, msg)
+    log.info("Sent stats message to user %s: %s", user_id, msg.replace("\n", " | "))
 
-    except Exception as e:
-        logging.error("Error sending stats message through Telegram client: %s", e)
-        raise e
-
-    logging.debug("Method `send_stats` finished.")
+    log.debug("Method `send_stats` finished.")
 
 
-def start_sending_pills_reminder(
-    scheduler: AsyncIOScheduler, client: TelegramClient, user_id: str = "nathy"
-):
+@log_errors
+def start_sending_pills_reminder(client: TelegramClient, user_id: str = "nathy"):
     """Starts a scheduled reminder for taking pills via Telegram.
 
-    This function configures a job in the provided scheduler to send a reminder message to a
-    specified user at a designated time. The reminder message is sent repeatedly, adjusting the
-    frequency based on the number of messages sent.
+    This function schedules a daily job to send a reminder message to a specified user at a
+    designated time. The reminder message is sent repeatedly, adjusting the frequency based on the
+    number of messages sent.
 
     Args:
-        scheduler (AsyncIOScheduler): The scheduler to manage the reminder job.
         client (TelegramClient): The Telegram client used to send messages.
         user_id (str, optional): The ID of the user to send reminders to. Defaults to "nathy".
 
     Raises:
         FileNotFoundError: If the configuration file cannot be found.
         yaml.YAMLError: If there is an error parsing the YAML configuration.
+        ValueError: If the pill reminder time is not configured for the user.
         Exception: If there is an error scheduling the job or sending the message.
     """
-    logging.debug("Running method `start_sending_pills_reminder`...")
-    try:
-        logging.info("Starting scheduled pill reminders for user: %s", user_id)
-        tconfig = read_yaml(TELEGRAM_CONFIG_PATH)
-        user = tconfig.get(user_id, {})
-        user_id = user.get("chat_id")
-        reminder_time = user.get("pills_reminder").get("time").split(":")
-        logging.debug("Resolved chat ID: %s", user_id)
-        logging.info("Pill reminder time set to: %s", reminder_time)
-
-        async def wrap(client: TelegramClient):
-            """Sends periodic pill reminder messages to a user via Telegram.
-
-            This asynchronous function sends a reminder message to the specified user at regular
-            intervals. The frequency of the messages adjusts dynamically based on the number of
-            messages sent, ensuring that reminders are sent consistently without overwhelming the
-            user.
-
-            Args:
-                client (TelegramClient): The Telegram client used to send messages.
-            """
-            global keep_sending_pill_reminder
-            keep_sending_pill_reminder = True
-            waiting_time, max_messages, cur_messages = 60, 5, 0
-            logging.info(
-                "Starting pill reminder loop for user %s with waiting time %d seconds and %d max "
-                "messages",
-                user_id,
-                waiting_time,
-                max_messages,
-            )
-
-            while keep_sending_pill_reminder:
-                if cur_messages == max_messages:
-                    waiting_time //= 2
-                    max_messages *= 2
-                    cur_messages = 0
-                    logging.info(
-                        "Adjusting waiting time to: %d seconds and max messages to: %d",
-                        waiting_time,
-                        max_messages,
-                    )
+    log.debug("Running method `start_sending_pills_reminder`...")
+    log.info("Starting scheduled pill reminders for user: %s", user_id)
+    user = get_user_config(user_id)
+    if user.pills_reminder_time is None:
+        log.error("No pill reminder time configured for user: %s", user_id)
+        raise ValueError(f"No pill reminder time configured for user: {user_id}")
 
-                cur_messages += 1
-                await client.send_message(
-                    user_id, "💊 Amorcito, recuerda tomarte la píldora a las 10. Te amo ❤️"
-                )
-                logging.info("Sent pill reminder message to user: %s", user_id)
-                await asyncio.sleep(waiting_time)
-
-        scheduler.add_job(
-            wrap,
-            "cron",
-            hour=reminder_time[0],
-            minute=reminder_time[1],
-            second=reminder_time[2],
-            args=[client],
+    reminder_time = user.pills_reminder_time
+    log.debug("Resolved chat ID: %s", user.chat_id)
+    log.info("Pill reminder time set to: %d seconds after midnight", reminder_time)
+
+    async def wrap(client: TelegramClient):
+        """Sends periodic pill reminder messages to a user via Telegram.
+
+        This asynchronous function sends a reminder message to the specified user at regular
+        intervals. The frequency of the messages adjusts dynamically based on the number of
+        messages sent, ensuring that reminders are sent consistently without overwhelming the
+        user. The wait between messages ends as soon as `stop_pill_event` is set.
+
+        The waiting time never drops below `MIN_PILL_REMINDER_WAITING_TIME`, and if Telegram still
+        asks to slow down, the loop waits as long as requested before sending the next reminder.
+
+        Args:
+            client (TelegramClient): The Telegram client used to send messages.
+        """
+        stop_pill_event.clear()
+        peer = await get_peer(client, user_id)
+        waiting_time, max_messages, cur_messages = 60, 5, 0
+        log.info(
+            "Starting pill reminder loop for user %s with waiting time %d seconds and %d max "
+            "messages",
+            user_id,
+            waiting_time,
+            max_messages,
         )
-        logging.info("Pill reminder job scheduled for user: %s at %s", user_id, reminder_time)
 
-    except FileNotFoundError as e:
-        logging.error("Configuration file not found: %s", e)
-        raise e
+        while True:
+            if cur_messages == max_messages:
+                waiting_time = max(waiting_time // 2, MIN_PILL_REMINDER_WAITING_TIME)
+                max_messages *= 2
+                cur_messages = 0
+                log.info(
+                    "Adjusting waiting time to: %d seconds and max messages to: %d",
+                    waiting_time,
+                    max_messages,
+                )
 
-    except yaml.YAMLError as e:
-        logging.error("Error parsing YAML configuration: %s", e)
-        raise e
+            delay = waiting_time
+            try:
+                await client.send_message(peer, PILL_REMINDER_MESSAGE)
+                cur_messages += 1
+                log.info("Sent pill reminder message to user: %s", user_id)
 
-    except Exception as e:
-        logging.error("Error scheduling the pill reminder job: %s", e)
-        raise e
+            except FloodWaitError as e:
+                delay = max(e.seconds, waiting_time)
+                log.warning("Pill reminder rate limited, waiting %d seconds to send it.", delay)
+
+            try:
+                await asyncio.wait_for(stop_pill_event.wait(), timeout=delay)
+                break
+
+            except asyncio.TimeoutError:
+                pass
+
+    schedule_daily_job(reminder_time, wrap, client)
+    log.info(
+        "Pill reminder job scheduled for user: %s at %d seconds after midnight",
+        user_id,
+        reminder_time,
+    )
 
-    logging.debug("Method `start_sending_pills_reminder` finished.")
+    log.debug("Method `start_sending_pills_reminder` finished.")
 
 
 def handle_stop_sending_pill_reminder_for_today(client: TelegramClient):
@@ -969,27 +1451,25 @@ def handle_stop_sending_pill_reminder_for_today(client: TelegramClient):
     Args:
         client (TelegramClient): The Telegram client used to add the event handler.
     """
-    logging.debug("Running method `handle_stop_sending_pill_reminder_for_today`...")
-    logging.info("Setting up event handler to stop sending pill reminders for today.")
-    tconfig = read_yaml(TELEGRAM_CONFIG_PATH)
-    nathy_id = tconfig.get("nathy", {}).get("chat_id")
-    logging.debug("Resolved chat ID for user 'nathy': %s", nathy_id)
+    log.debug("Running method `handle_stop_sending_pill_reminder_for_today`...")
+    log.info("Setting up event handler to stop sending pill reminders for today.")
+    nathy_id = get_user_config("nathy").chat_id
+    log.debug("Resolved chat ID for user 'nathy': %s", nathy_id)
 
     async def handler(event: Message | events.NewMessage):
         """Handles the event to stop sending pill reminders.
 
-        This asynchronous function is triggered by an incoming message event and sets a global flag
-        to stop the pill reminder process. It ensures that no further reminders are sent once this
-        event is processed.
+        This asynchronous function is triggered by an incoming message event and sets the event
+        that stops the pill reminder process. The reminder loop is waiting on it, so no further
+        reminders are sent once this event is processed.
 
         Args:
             event (Message | events.NewMessage): The event triggered by a new message.
         """
-        logging.info("Received message to stop sending pill reminders.")
-        global keep_sending_pill_reminder
-        keep_sending_pill_reminder = False
-        logging.info("Pill reminder sending has been stopped.")
+        log.info("Received message to stop sending pill reminders.")
+        stop_pill_event.set()
+        log.info("Pill reminder sending has been stopped.")
 
     client.add_event_handler(handler, events.NewMessage(nathy_id, incoming=True))
-    logging.debug("Event handler added for user 'nathy' to stop pill reminders.")
-    logging.debug("Method `handle_stop_sending_pill_reminder_for_today` finished.")
+    log.debug("Event handler added for user 'nathy' to stop pill reminders.")
+    log.debug("Method `handle_stop_sending_pill_reminder_for_today` finished.")